@@ -6,20 +6,13 @@ Author: [Aamir Sohail)
 """
 
 import argparse
-import datetime
 import logging
 import os
+import re
 import sys
 import csv
-from pathlib import Path
-from dotenv import load_dotenv
-from concurrent.futures import ThreadPoolExecutor
-
-# Load environment variables from botex.env
-load_dotenv("botex.env")
-
-# Import experiment execution functions
-from experiment import run_session
+import functools
+import types
 
 # Set up logging
 logging.basicConfig(
@@ -29,99 +22,178 @@ logging.basicConfig(
 )
 logger = logging.getLogger("multi_app_cli")
 
-# Custom log filter to exclude noisy HTTP request logs
+# Third-party loggers that emit a line per HTTP request
+NOISY_LOGGERS = ("httpx", "httpcore")
+
+# Custom log filter to exclude noisy request logs
+NOISY_MESSAGE_PATTERN = re.compile(r"HTTP Request:|Throttling: Request error:")
+
 class LogFilter(logging.Filter):
     def filter(self, record):
-        message = record.getMessage()
-        if "HTTP Request:" in message or "Throttling: Request error:" in message:
-            return False
-        return True
+        # Only format records that carry %-args; the noisy text may be in either part
+        message = record.getMessage() if record.args else str(record.msg)
+        return not NOISY_MESSAGE_PATTERN.search(message)
+
+
+def configure_logging(verbose=False):
+    """
+    Set the root log level and suppress noisy request logs.
+    
+    In the default (non-verbose) mode the HTTP client loggers are silenced at
+    the level gate and only botex's own records go through the filter. In
+    verbose mode every handler filters so DEBUG output from those loggers
+    still comes through.
+    
+    Args:
+        verbose (bool): Enable DEBUG-level logging
+    """
+    logging.getLogger().setLevel(logging.DEBUG if verbose else logging.INFO)
+    
+    if verbose:
+        for handler in logging.getLogger().handlers:
+            handler.addFilter(LogFilter())
+    else:
+        for noisy_logger in NOISY_LOGGERS:
+            logging.getLogger(noisy_logger).setLevel(logging.WARNING)
+        logging.getLogger("botex").addFilter(LogFilter())
+
 
-for handler in logging.getLogger().handlers:
-    handler.addFilter(LogFilter())
+@functools.lru_cache(maxsize=None)
+def load_env():
+    """
+    Load environment variables from botex.env (once per process).
+    
+    Deferred until environment-dependent code runs so that --help and
+    --list-apps don't pay for it. The once-only guard lives in this process
+    rather than in os.environ, so child processes and re-exec'd CLIs still
+    load botex.env themselves.
+    """
+    from dotenv import load_dotenv
+    load_dotenv("botex.env")
+
+
+# Model name marking a human participant in player_models.csv (any case)
+HUMAN_MODEL = "human"
+
+# Provider table: (provider, models env var, API key env var, full_name format, default models)
+PROVIDER_SPECS = (
+    ('gemini', 'GOOGLE_MODELS', 'GOOGLE_API_KEY', 'gemini/{}', 'gemini-1.5-flash'),
+    ('openai', 'OPENAI_MODELS', 'OPENAI_API_KEY', '{}', ''),
+    ('anthropic', 'ANTHROPIC_MODELS', 'ANTHROPIC_API_KEY', 'anthropic/{}', ''),
+    ('groq', 'GROQ_MODELS', 'GROQ_API_KEY', 'groq/{}', ''),
+    ('deepseek', 'DEEPSEEK_MODELS', 'DEEPSEEK_API_KEY', 'deepseek/{}', ''),
+    ('local', 'LOCAL_LLM_MODELS', None, 'llamacpp', ''),
+)
 
 
+def split_model_list(models_str):
+    """
+    Lazily split a comma-separated model list, stripping each name once
+    and skipping empty entries. Names are interned so that lookups against
+    names read from player_models.csv can short-circuit on identity.
+    
+    Args:
+        models_str (str): Comma-separated model names from the environment
+        
+    Returns:
+        generator: Non-empty, stripped model names
+    """
+    return (sys.intern(name) for name in map(str.strip, models_str.split(',')) if name)
+
+
+@functools.lru_cache(maxsize=1)
 def get_available_models():
     """
     Get all available models from environment variables.
+
+    The result is cached for the lifetime of the process since the environment
+    is fixed once botex.env has been loaded. Use get_available_models.cache_clear()
+    to force a re-read. Every caller shares the cached result, so it is returned
+    as a read-only mapping.
     
     Returns:
-        dict: Dictionary mapping model names to their full model strings and provider
+        mapping: Read-only mapping of model names to their full model strings and provider
     """
+    load_env()
     available_models = {}
     
-    # Gemini models
-    google_models_str = os.environ.get('GOOGLE_MODELS', 'gemini-1.5-flash')
-    google_models = [m.strip() for m in google_models_str.split(',') if m.strip()]
-    for model in google_models:
-        model_name = model.strip()
-        available_models[model_name] = {
-            'full_name': f"gemini/{model_name}", 
-            'provider': 'gemini',
-            'api_key_env': 'GOOGLE_API_KEY'
-        }
-    
-    # OpenAI models
-    openai_models_str = os.environ.get('OPENAI_MODELS', '')
-    if openai_models_str:
-        openai_models = [m.strip() for m in openai_models_str.split(',') if m.strip()]
-        for model in openai_models:
-            model_name = model.strip()
-            available_models[model_name] = {
-                'full_name': model_name,
-                'provider': 'openai',
-                'api_key_env': 'OPENAI_API_KEY'
-            }
-    
-    # Anthropic models
-    anthropic_models_str = os.environ.get('ANTHROPIC_MODELS', '')
-    if anthropic_models_str:
-        anthropic_models = [m.strip() for m in anthropic_models_str.split(',') if m.strip()]
-        for model in anthropic_models:
-            model_name = model.strip()
-            available_models[model_name] = {
-                'full_name': f"anthropic/{model_name}",
-                'provider': 'anthropic',
-                'api_key_env': 'ANTHROPIC_API_KEY'
-            }
-
-    # Groq models  
-    groq_models_str = os.environ.get('GROQ_MODELS', '')
-    if groq_models_str:
-        groq_models = [m.strip() for m in groq_models_str.split(',') if m.strip()]
-        for model in groq_models:
-            model_name = model.strip()
-            available_models[model_name] = {
-                'full_name': f"groq/{model_name}",
-                'provider': 'groq', 
-                'api_key_env': 'GROQ_API_KEY'
-            }
-
-    # DeepSeek models
-    deepseek_models_str = os.environ.get('DEEPSEEK_MODELS', '')
-    if deepseek_models_str:
-        deepseek_models = [m.strip() for m in deepseek_models_str.split(',') if m.strip()]
-        for model in deepseek_models:
-            model_name = model.strip()
-            available_models[model_name] = {
-                'full_name': f"deepseek/{model_name}",
-                'provider': 'deepseek',
-                'api_key_env': 'DEEPSEEK_API_KEY'
-            }
-    
-    # Local models
-    local_models_str = os.environ.get('LOCAL_LLM_MODELS', '')
-    if local_models_str:
-        local_models = [m.strip() for m in local_models_str.split(',') if m.strip()]
-        for model in local_models:
-            model_name = model.strip()
-            available_models[model_name] = {
-                'full_name': 'llamacpp',
-                'provider': 'local',
-                'api_key_env': None
-            }
-    
-    return available_models
+    for provider, models_env, api_key_env, name_format, default in PROVIDER_SPECS:
+        models_str = os.environ.get(models_env, default)
+        if not models_str:
+            continue
+        for model_name in split_model_list(models_str):
+            available_models[model_name] = types.MappingProxyType({
+                'full_name': name_format.format(model_name),
+                'provider': provider,
+                'api_key_env': api_key_env
+            })
+    
+    # Read-only snapshot so callers can't mutate the cached result
+    return types.MappingProxyType(available_models)
+
+
+def iter_player_model_rows(f):
+    """
+    Stream (player_id, model_name, role) rows from an open player_models.csv file.
+    
+    The header is read and validated immediately; column positions are resolved
+    once. Values are stripped strings; role is '' when the optional role column
+    is absent or empty. Rows missing required columns are skipped with a warning.
+    
+    Args:
+        f: Open file object positioned at the header row
+        
+    Returns:
+        generator: (player_id, model_name, role) tuples
+        
+    Raises:
+        ValueError: If the file is empty or lacks a required column
+    """
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("file is empty")
+    
+    missing_columns = [c for c in ('player_id', 'model_name') if c not in header]
+    if missing_columns:
+        raise ValueError(f"missing required column(s): {', '.join(missing_columns)}")
+    
+    player_id_idx = header.index('player_id')
+    model_name_idx = header.index('model_name')
+    role_idx = header.index('role') if 'role' in header else -1
+    min_length = max(player_id_idx, model_name_idx) + 1
+    
+    def rows():
+        for row in reader:
+            if not row:  # Skip blank lines, as DictReader did
+                continue
+            if len(row) < min_length:
+                logger.warning(f"Skipping incomplete row on line {reader.line_num}: {row}")
+                continue
+            role = row[role_idx].strip() if 0 <= role_idx < len(row) else ''
+            yield row[player_id_idx].strip(), row[model_name_idx].strip(), role
+    
+    return rows()
+
+
+def summarize_app(app_name):
+    """
+    Count participants and detect role assignments in an app's player_models.csv.
+    
+    Args:
+        app_name (str): Name of the app
+        
+    Returns:
+        tuple: (participant_count, has_roles)
+    """
+    participant_count = 0
+    has_roles = False
+    with open(os.path.join(app_name, "player_models.csv"), 'r') as f:
+        for _, _, role in iter_player_model_rows(f):
+            participant_count += 1
+            if role:
+                has_roles = True
+    return participant_count, has_roles
 
 
 def get_app_specific_model_mapping(app_name):
@@ -131,59 +203,92 @@ def get_app_specific_model_mapping(app_name):
     Args:
         app_name (str): Name of the app (e.g., 'rps', 'rps_repeat')
         
+    Results are memoized per file and modification time, so repeated calls
+    (e.g. one per session) only re-read the CSV after it changes.
+    
     Returns:
-        tuple: (player_models dict, player_roles dict, is_human list, total_participants) or (None, None, None, 0) if file not found
+        tuple: (player_models mapping, player_roles mapping, is_human tuple, total_participants) or (None, None, None, 0) if file not found
     """
-    app_dir = Path(app_name)
-    file_path = app_dir / "player_models.csv"
+    file_path = os.path.join(app_name, "player_models.csv")
     
-    if not file_path.exists():
+    try:
+        mtime = os.stat(file_path).st_mtime_ns
+    except OSError:
         logger.error(f"App-specific model mapping file not found at {file_path}")
         return None, None, None, 0
+    
+    return load_model_mapping(file_path, mtime)
+
+
+@functools.lru_cache(maxsize=32)
+def load_model_mapping(file_path, mtime):
+    """
+    Parse a player_models.csv file into read-only mapping snapshots.
+    
+    Args:
+        file_path (str): Path to the player_models.csv file
+        mtime (int): File modification time, used only as part of the cache key
         
+    Returns:
+        tuple: (player_models mapping, player_roles mapping, is_human tuple, total_participants) or (None, None, None, 0) on error
+    """
     player_models = {}
     player_roles = {}
-    participant_assignments = []
+    is_human_list = []
+    in_order = True  # player_ids are normally listed as 1..n
     
     try:
-        with open(file_path, 'r') as f:
-            reader = csv.DictReader(f)
-            fieldnames = reader.fieldnames
+        f = open(file_path, 'r', newline='')
+    except OSError as e:
+        logger.error(f"Error opening model mapping file {file_path}: {str(e)}")
+        return None, None, None, 0
+    
+    with f:
+        try:
+            rows = iter_player_model_rows(f)
+        except ValueError as e:
+            logger.error(f"Error loading model mapping from {file_path}: {str(e)}")
+            return None, None, None, 0
+        
+        for player_id, model_name, role in rows:
+            try:
+                player_id = int(player_id)
+            except ValueError:
+                logger.warning(f"Skipping row with invalid player_id '{player_id}' in {file_path}")
+                continue
             
-            # Check if role column exists
-            has_role_column = 'role' in fieldnames
+            # Normalise the human marker once so later checks are plain comparisons
+            is_human = model_name.lower() == HUMAN_MODEL
+            if is_human:
+                model_name = HUMAN_MODEL
+            else:
+                model_name = sys.intern(model_name)
             
-            for row in reader:
-                player_id = int(row['player_id'])
-                model_name = row['model_name'].strip()
-                
-                # Handle role assignment (optional column)
-                role = None
-                if has_role_column and row.get('role'):
-                    role = row['role'].strip()
-                    if role:  # Only assign if not empty
-                        player_roles[player_id] = role
-                
-                participant_assignments.append((player_id, model_name))
-                player_models[player_id] = model_name
-        
-        # Sort by player_id to ensure correct order
-        participant_assignments.sort(key=lambda x: x[0])
-        
-        # Create the is_human boolean list
-        is_human_list = [model_name.lower() == "human" for _, model_name in participant_assignments]
-        
-        total_participants = len(participant_assignments)
-        
-        logger.info(f"Loaded {total_participants} participant assignments from {file_path}")
-        if player_roles:
-            logger.info(f"Found role assignments for players: {list(player_roles.keys())}")
-        
-        return player_models, player_roles, is_human_list, total_participants
-        
-    except Exception as e:
-        logger.error(f"Error loading model mapping: {str(e)}")
-        return None, None, None, 0
+            # Handle role assignment (optional column)
+            if role:  # Only assign if not empty
+                player_roles[player_id] = role
+            
+            player_models[player_id] = model_name
+            
+            # Build the is_human list inline while player_ids arrive in order
+            if in_order and player_id == len(is_human_list) + 1:
+                is_human_list.append(is_human)
+            else:
+                in_order = False
+    
+    # Fall back to sorting by player_id for sparse or out-of-order files
+    if not in_order:
+        is_human_list = [model_name == HUMAN_MODEL for _, model_name in sorted(player_models.items())]
+    
+    total_participants = len(is_human_list)
+    
+    logger.info(f"Loaded {total_participants} participant assignments from {file_path}")
+    if player_roles:
+        logger.info(f"Found role assignments for players: {list(player_roles.keys())}")
+    
+    # Read-only snapshots so callers can't mutate the cached result
+    return (types.MappingProxyType(player_models), types.MappingProxyType(player_roles),
+            tuple(is_human_list), total_participants)
 
 
 def validate_player_models(player_models, available_models):
@@ -200,38 +305,48 @@ def validate_player_models(player_models, available_models):
     if not player_models:
         return True, None
         
-    for player_id, model_name in player_models.items():
-        # Skip validation for human participants
-        if model_name.lower() == "human":
-            continue
-            
-        if model_name not in available_models:
-            return False, f"Player {player_id} is assigned model '{model_name}' which is not available in botex.env"
+    # Human participants (normalised at load time) need no model
+    missing_models = set(player_models.values()) - available_models.keys() - {HUMAN_MODEL}
+    if not missing_models:
+        return True, None
     
-    return True, None
+    # Report every unavailable model at once, with the players that use it
+    problems = []
+    for model_name in sorted(missing_models):
+        player_ids = [str(pid) for pid, model in player_models.items() if model == model_name]
+        problems.append(f"'{model_name}' (players {', '.join(player_ids)})")
+    return False, f"Models not available in botex.env: {'; '.join(problems)}"
 
 
+@functools.lru_cache(maxsize=1)
 def get_available_apps():
     """
     Get list of available oTree apps by checking for directories with __init__.py and player_models.csv
     
+    The directory scan is cached for the duration of the run; call
+    get_available_apps.cache_clear() to rescan.
+    
     Returns:
-        list: List of available app names
+        tuple: Sorted available app names
     """
     available_apps = []
-    current_dir = Path('.')
     
-    for item in current_dir.iterdir():
-        if item.is_dir() and not item.name.startswith('.') and not item.name.startswith('_'):
+    # os.scandir caches the entry type, avoiding a stat() per directory entry
+    with os.scandir('.') as entries:
+        for entry in entries:
+            if entry.name.startswith(('.', '_')) or not entry.is_dir():
+                continue
             # Check if it's a valid oTree app (has __init__.py and player_models.csv)
-            if (item / '__init__.py').exists() and (item / 'player_models.csv').exists():
-                available_apps.append(item.name)
+            if (os.path.isfile(os.path.join(entry.path, '__init__.py')) and
+                    os.path.isfile(os.path.join(entry.path, 'player_models.csv'))):
+                available_apps.append(entry.name)
     
-    return sorted(available_apps)
+    return tuple(sorted(available_apps))
 
 
-def parse_arguments():
-    """Parse command line arguments with comprehensive help and validation"""
+@functools.lru_cache(maxsize=1)
+def build_parser():
+    """Build the command line argument parser (constructed once and reused)"""
     
     parser = argparse.ArgumentParser(
         description="""
@@ -291,6 +406,13 @@ Examples:
         help="Number of concurrent experimental sessions to run (default: 1)"
     )
 
+    parser.add_argument(
+        "--max-concurrent", 
+        type=int, 
+        default=None,
+        help="Maximum number of sessions running at once (default: all sessions)"
+    )
+
     # === OUTPUT CONTROL ===
     parser.add_argument(
         "-o", "--output-dir", 
@@ -333,6 +455,12 @@ Examples:
         help="Validate app configuration without running experiments"
     )
 
+    parser.add_argument(
+        "--fail-fast", 
+        action="store_true",
+        help="With --validate-only, stop at the first failing check"
+    )
+
     parser.add_argument(
         "--dry-run", 
         action="store_true",
@@ -352,7 +480,14 @@ Examples:
         help="Disable automatic browser opening"
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+def parse_arguments():
+    """Parse command line arguments with comprehensive help and validation"""
+    
+    args = build_parser().parse_args()
+    configure_logging(args.verbose)
     
     # Handle listing apps
     if args.list_apps:
@@ -361,23 +496,10 @@ Examples:
         print("=" * 40)
         if apps:
             for app in apps:
-                app_dir = Path(app)
                 try:
-                    # Try to get basic info about the app
-                    model_file = app_dir / "player_models.csv"
-                    if model_file.exists():
-                        with open(model_file, 'r') as f:
-                            reader = csv.DictReader(f)
-                            participants = list(reader)
-                            participant_count = len(participants)
-                            
-                            # Check for role assignments
-                            has_roles = any('role' in row and row['role'].strip() for row in participants)
-                            role_info = " (with roles)" if has_roles else ""
-                            
-                        print(f"  {app:<15} ({participant_count} participants{role_info})")
-                    else:
-                        print(f"  {app:<15} (configuration incomplete)")
+                    participant_count, has_roles = summarize_app(app)
+                    role_info = " (with roles)" if has_roles else ""
+                    print(f"  {app:<15} ({participant_count} participants{role_info})")
                 except:
                     print(f"  {app:<15} (configuration error)")
         else:
@@ -389,6 +511,8 @@ Examples:
         print()
         sys.exit(0)
     
+    load_env()
+    
     # Validate app selection
     if not args.app:
         available_apps = get_available_apps()
@@ -400,6 +524,10 @@ Examples:
         print("Use --list-apps for more details.")
         sys.exit(1)
     
+    if args.max_concurrent is not None and args.max_concurrent < 1:
+        print("ERROR: --max-concurrent must be at least 1.")
+        sys.exit(1)
+    
     # Validate selected app exists
     available_apps = get_available_apps()
     if args.app not in available_apps:
@@ -0,0 +1 @@
+# Keeps the repository root importable (experiment, cli) when running pytest
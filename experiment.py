@@ -6,122 +6,210 @@ This module contains all the logic for running individual experimental sessions
 with app-specific configurations, prompting strategies, and per-player role assignments.
 """
 
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock, Thread
 from pathlib import Path
+from urllib.parse import urlparse
 import datetime
 import logging
 import os
 import re
 import platform
+import socket
 import subprocess
 import time
 import webbrowser
 import csv
+import functools
 import requests
 import botex
-import litellm
 import sqlite3
 import json
 import importlib.util
+import itertools
 
 logger = logging.getLogger("multi_app_experiment")
 
+# Patterns used while exporting responses, compiled once
+ROUND_PATTERN = re.compile(r'[Rr]ound\s*(\d+)')
+QUESTION_NUMBER_PATTERN = re.compile(r'\d+')
+INITIAL_QUESTION_PATTERN = re.compile(r'choice|decision|select|pick|vote', re.IGNORECASE)
 
+# Columns of the enhanced response export
+RESPONSE_FIELDNAMES = ('session_id', 'participant_id', 'round', 'question_id', 'answer', 'reason', 'summary', 'prompt')
 
+# Output file extensions that make export_response_data write SQLite instead of CSV
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
 
-def load_app_prompts(app_name, role=None):
+# Appended to every prompt sent to local (TinyLLaMA) models
+BREVITY_INSTRUCTION = "\n\nIMPORTANT: Your responses must be extremely brief and concise."
+
+# Write buffer for streamed response CSVs; rows carry full prompts, so the default 8 KB fills fast
+CSV_WRITE_BUFFER = 1 << 16
+
+# Bounds (seconds) for polling oTree while waiting for human participants
+POLL_INTERVAL_MIN = 5
+POLL_INTERVAL_MAX = 60
+
+
+# Loaded prompts modules and their results, shared by all sessions and bot threads.
+# One (prompts.py mtime, module) entry per app; an edit replaces the entry and drops
+# the results derived from the old module, so nothing accumulates over a long run.
+PROMPTS_CACHE_LOCK = Lock()
+PROMPTS_MODULE_CACHE = {}
+APP_PROMPTS_CACHE = {}  # module -> {role: prompts}
+APP_ROLES_CACHE = {}  # module -> roles
+
+
+def load_prompts_module(app_name):
+    """
+    Import an app's prompts.py, reusing the cached module while the file is unchanged.
+    
+    Args:
+        app_name (str): Name of the app
+    
+    Returns:
+        module: The loaded prompts module, or None if the app has no prompts.py
+    """
+    prompts_file = Path(app_name) / "prompts.py"
+    try:
+        mtime = prompts_file.stat().st_mtime_ns
+    except OSError:
+        return None
+    
+    with PROMPTS_CACHE_LOCK:
+        cached = PROMPTS_MODULE_CACHE.get(app_name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        spec = importlib.util.spec_from_file_location(f"{app_name}_prompts", prompts_file)
+        prompts_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(prompts_module)
+        PROMPTS_MODULE_CACHE[app_name] = (mtime, prompts_module)
+        
+        # prompts.py changed: forget everything derived from the previous version
+        if cached is not None:
+            APP_PROMPTS_CACHE.pop(cached[1], None)
+            APP_ROLES_CACHE.pop(cached[1], None)
+    return prompts_module
+
+
+def is_current_prompts_module(app_name, prompts_module):
+    """Check (with PROMPTS_CACHE_LOCK held) that prompts_module is the app's cached module,
+    so results derived from a replaced module are not cached after it was evicted"""
+    cached = PROMPTS_MODULE_CACHE.get(app_name)
+    return cached is not None and cached[1] is prompts_module
+
+
+def load_app_prompts(app_name, role=None, prompts_module=None):
     """
     Load app-specific prompts from the app's prompts.py file.
     Works with any app by trying standard function naming conventions.
+    Results are cached per prompts module and role.
     
     Args:
         app_name (str): Name of the app
         role (str): Role for prompting strategy (app-specific, can be None)
+        prompts_module (module): Already-loaded prompts module, to skip the file lookup
     
     Returns:
         dict: Prompts dictionary for botex, or None if no prompts can be loaded
     """
-    app_dir = Path(app_name)
-    prompts_file = app_dir / "prompts.py"
-    
-    if not prompts_file.exists():
-        logger.error(f"App-specific prompts file not found: {prompts_file}")
-        return None
-    
     try:
         # Load the prompts module dynamically
-        spec = importlib.util.spec_from_file_location(f"{app_name}_prompts", prompts_file)
-        prompts_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(prompts_module)
+        if prompts_module is None:
+            prompts_module = load_prompts_module(app_name)
+        if prompts_module is None:
+            logger.error(f"App-specific prompts file not found: {Path(app_name) / 'prompts.py'}")
+            return None
+        
+        with PROMPTS_CACHE_LOCK:
+            module_prompts = APP_PROMPTS_CACHE.get(prompts_module, {})
+            if role in module_prompts:
+                prompts = module_prompts[role]
+                return dict(prompts) if prompts is not None else None
         
         prompts = None
         
         # Strategy 1: Try standard generic function names (most flexible)
-        if hasattr(prompts_module, 'get_prompts'):
+        get_prompts = getattr(prompts_module, 'get_prompts', None)
+        if get_prompts is not None:
             try:
-                prompts = prompts_module.get_prompts(role)
+                prompts = get_prompts(role)
                 logger.info(f"Loaded prompts using get_prompts() for app '{app_name}' with role '{role or 'default'}'")
             except Exception as e:
                 logger.warning(f"get_prompts() failed for role '{role}': {e}")
                 # Try without role
                 try:
-                    prompts = prompts_module.get_prompts(None)
+                    prompts = get_prompts(None)
                     logger.info(f"Loaded default prompts using get_prompts() for app '{app_name}'")
                 except Exception as e2:
                     logger.warning(f"get_prompts() failed for default: {e2}")
+        
+        with PROMPTS_CACHE_LOCK:
+            if is_current_prompts_module(app_name, prompts_module):
+                APP_PROMPTS_CACHE.setdefault(prompts_module, {})[role] = prompts
+        return dict(prompts) if prompts is not None else None
             
     except Exception as e:
         logger.error(f"Error loading app prompts: {str(e)}")
         return None
 
 
-def get_available_app_roles(app_name):
+def get_available_app_roles(app_name, prompts_module=None):
     """
     Get list of available roles for an app by checking its prompts.py file.
     
     Args:
         app_name (str): Name of the app
+        prompts_module (module): Already-loaded prompts module, to skip the file lookup
         
     Returns:
         list: List of available role names, empty if none found
     """
-    app_dir = Path(app_name)
-    prompts_file = app_dir / "prompts.py"
-    
-    if not prompts_file.exists():
-        return []
-    
     try:
         # Load the prompts module dynamically
-        spec = importlib.util.spec_from_file_location(f"{app_name}_prompts", prompts_file)
-        prompts_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(prompts_module)
+        if prompts_module is None:
+            prompts_module = load_prompts_module(app_name)
+        if prompts_module is None:
+            return []
+        
+        with PROMPTS_CACHE_LOCK:
+            if prompts_module in APP_ROLES_CACHE:
+                return list(APP_ROLES_CACHE[prompts_module])
         
         available_roles = []
         
         # Strategy 1: Check for get_available_roles() function
-        if hasattr(prompts_module, 'get_available_roles'):
+        get_roles = getattr(prompts_module, 'get_available_roles', None)
+        if get_roles is not None:
             try:
-                available_roles = prompts_module.get_available_roles()
-                return available_roles
+                available_roles = get_roles()
             except Exception as e:
                 logger.warning(f"get_available_roles() failed: {e}")
         
-        return available_roles
+        with PROMPTS_CACHE_LOCK:
+            if is_current_prompts_module(app_name, prompts_module):
+                APP_ROLES_CACHE[prompts_module] = available_roles
+        return list(available_roles)
         
     except Exception as e:
         logger.warning(f"Could not determine available roles for {app_name}: {str(e)}")
         return []
 
 
+@functools.lru_cache(maxsize=16)
+def add_brevity_instruction(prompt_items):
+    """Append BREVITY_INSTRUCTION to each (key, prompt) pair, once per distinct prompt set"""
+    return tuple((key, value + BREVITY_INSTRUCTION) for key, value in prompt_items)
+
+
 def configure_tinyllama_params(args, user_prompts):
     """Configure parameters for TinyLLaMA bots to be used with run_bots_on_session"""
     
-    # Add explicit brevity instructions to all prompts
-    modified_prompts = {}
-    for key, value in user_prompts.items():
-        if isinstance(value, str):
-            modified_prompts[key] = value + "\n\nIMPORTANT: Your responses must be extremely brief and concise."
+    # Add explicit brevity instructions to all prompts; local bots sharing a role reuse the result
+    prompt_items = tuple((key, value) for key, value in user_prompts.items() if isinstance(value, str))
+    modified_prompts = dict(add_brevity_instruction(prompt_items))
     
     # Make sure temperature is high enough to avoid repetition
     temperature = max(args.temperature, 0.8)
@@ -139,34 +227,44 @@ def configure_tinyllama_params(args, user_prompts):
     return modified_prompts, additional_params
 
 
-def export_response_data(csv_file, botex_db, session_id):
-    """Export botex response data with proper round and question tracking"""
-    try:
-        # Connect to botex database
-        conn = sqlite3.connect(botex_db)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Get conversations for this session
-        cursor.execute("SELECT * FROM conversations")
-        conversations = [dict(row) for row in cursor.fetchall()]
-        
-        # Filter by session_id if provided
-        if session_id:
-            conversations = [
-                c for c in conversations 
-                if json.loads(c['bot_parms'])['session_id'] == session_id
-            ]
-        
-        enhanced_responses = []
-        
-        for conversation in conversations:
+def iter_response_batches(cursor):
+    """
+    Parse botex conversations into response rows, one batch per conversation.
+    
+    Args:
+        cursor: sqlite3 cursor over (id, bot_parms, conversation) tuples ordered by id, rowid
+    
+    Yields:
+        list: Response tuples (in RESPONSE_FIELDNAMES order) for one participant,
+        from all of its conversations, sorted by round and question order
+    """
+    # Sort responses by participant, round, and question order
+    def extract_question_number(question_id):
+        """Extract question number for sorting"""
+        # Look for the first number in question_id
+        number_match = QUESTION_NUMBER_PATTERN.search(str(question_id))
+        return int(number_match.group()) if number_match else 999
+    
+    def response_sort_key(x):
+        # x is (session_id, participant_id, round, question_id, ...)
+        return (
+            x[1], 
+            x[2], 
+            extract_question_number(x[3]),
+            x[3]
+        )
+    
+    # A participant can have several conversation rows (e.g. a restarted bot); they are
+    # adjacent because the query orders by id, and are sorted together like one export
+    for participant_id, conversations in itertools.groupby(cursor, key=lambda row: row[0]):
+        participant_responses = []
+        for _, bot_parms_json, conversation_json in conversations:
             try:
-                bot_parms = json.loads(conversation['bot_parms'])
-                participant_id = conversation['id']
+                bot_parms = json.loads(bot_parms_json)
+                conversation_session_id = bot_parms.get('session_id', '')
                 
                 # Parse the conversation messages
-                messages = json.loads(conversation['conversation'])
+                messages = json.loads(conversation_json)
                 
                 # Track rounds and questions more systematically
                 current_round = 1
@@ -179,14 +277,15 @@ def export_response_data(csv_file, botex_db, session_id):
                         current_prompt = message.get('content', '')
                         
                         # Detect round transitions by looking for round indicators in prompts
-                        round_match = re.search(r'[Rr]ound\s*(\d+)', current_prompt)
+                        round_match = ROUND_PATTERN.search(current_prompt)
                         if round_match:
                             detected_round = int(round_match.group(1))
                             if detected_round != current_round:
                                 current_round = detected_round
                                 questions_answered_in_round = 0
                         
-                        previous_prompt = current_prompt
+                        # Truncate once per prompt rather than once per answer
+                        previous_prompt = current_prompt[:500] + '...' if len(current_prompt) > 500 else current_prompt
                     
                     elif message.get('role') == 'assistant':
                         # This is a bot response
@@ -203,13 +302,10 @@ def export_response_data(csv_file, botex_db, session_id):
                             if answers:
                                 # Check if this looks like a new round based on question patterns
                                 # If we see questions that suggest round restart, increment round
-                                question_ids = list(answers.keys())
                                 
                                 # Simple heuristic: if we've answered questions and now see 
                                 # what looks like initial questions again, it might be a new round
-                                initial_question_patterns = ['choice', 'decision', 'select', 'pick', 'vote']
-                                looks_like_initial = any(pattern in str(qid).lower() for qid in question_ids 
-                                                       for pattern in initial_question_patterns)
+                                looks_like_initial = any(INITIAL_QUESTION_PATTERN.search(qid) for qid in answers)
                                 
                                 if looks_like_initial and questions_answered_in_round > 2:
                                     current_round += 1
@@ -219,16 +315,16 @@ def export_response_data(csv_file, botex_db, session_id):
                                     if question_id == 'round':
                                         continue
                                     
-                                    enhanced_responses.append({
-                                        'session_id': bot_parms.get('session_id', ''),
-                                        'participant_id': participant_id,
-                                        'round': current_round,
-                                        'question_id': question_id,
-                                        'answer': answer_data.get('answer', ''),
-                                        'reason': answer_data.get('reason', ''),
-                                        'summary': summary,
-                                        'prompt': previous_prompt[:500] + '...' if len(previous_prompt) > 500 else previous_prompt
-                                    })
+                                    participant_responses.append((
+                                        conversation_session_id,
+                                        participant_id,
+                                        current_round,
+                                        question_id,
+                                        answer_data.get('answer', ''),
+                                        answer_data.get('reason', ''),
+                                        summary,
+                                        previous_prompt
+                                    ))
                                     
                                     questions_answered_in_round += 1
                             
@@ -237,33 +333,100 @@ def export_response_data(csv_file, botex_db, session_id):
                             continue
                             
             except (json.JSONDecodeError, KeyError) as e:
-                logger.warning(f"Error processing conversation {conversation.get('id', 'unknown')}: {str(e)}")
+                logger.warning(f"Error processing conversation {participant_id}: {str(e)}")
                 continue
+            
+        participant_responses.sort(key=response_sort_key)
+        yield participant_responses
+
+
+def write_responses_to_sqlite(response_batches, db_file):
+    """
+    Bulk-insert response rows into a 'responses' table of a fresh SQLite database.
+    
+    The database is built in a temporary file next to db_file and moved into place
+    only once every row is committed, so an interrupted export never leaves a
+    half-written database that looks like a valid one.
+    
+    Args:
+        response_batches: Iterable of lists of response tuples
+        db_file (str): Path of the SQLite file to (re)create
+    
+    Returns:
+        int: Number of rows written
+    """
+    tmp_file = f"{db_file}.tmp"
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)  # Left over from an earlier interrupted export
+    
+    n_responses = 0
+    try:
+        conn = sqlite3.connect(tmp_file)
+        try:
+            # The temporary file is brand new and discarded on failure, so a rollback
+            # journal on disk buys nothing; the commit itself is still synced
+            conn.execute("PRAGMA journal_mode = MEMORY")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            insert_sql = f"INSERT INTO responses VALUES ({', '.join('?' * len(RESPONSE_FIELDNAMES))})"
+            with conn:  # Single transaction for the table and all batches
+                conn.execute(
+                    "CREATE TABLE responses (session_id text, participant_id text, round integer, "
+                    "question_id text, answer text, reason text, summary text, prompt text)"
+                )
+                for batch in response_batches:
+                    conn.executemany(insert_sql, batch)
+                    n_responses += len(batch)
+        finally:
+            conn.close()
+        os.replace(tmp_file, db_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    return n_responses
+
+
+def export_response_data(csv_file, botex_db, session_id):
+    """
+    Export botex response data with proper round and question tracking.
+    
+    The output is a CSV file, or a SQLite database with a 'responses' table
+    when csv_file ends in .sqlite, .sqlite3 or .db.
+    """
+    try:
+        # Connect to botex database read-only: bots have finished writing by now,
+        # and a read-only handle never takes write locks
+        conn = sqlite3.connect(f"{Path(botex_db).resolve().as_uri()}?mode=ro", uri=True)
+        cursor = conn.cursor()
+        
+        # Get conversations for this session, letting SQLite filter by session_id
+        # so non-matching rows are never decoded in Python
+        if session_id:
+            cursor.execute(
+                "SELECT id, bot_parms, conversation FROM conversations "
+                "WHERE json_extract(bot_parms, '$.session_id') = ? ORDER BY id, rowid",
+                (session_id,)
+            )
+        else:
+            cursor.execute("SELECT id, bot_parms, conversation FROM conversations ORDER BY id, rowid")
+        
+        # Conversations arrive ordered by participant, so only one conversation's
+        # responses are held in memory and sorted at a time
+        response_batches = iter_response_batches(cursor)
         
-        # Sort responses by participant, round, and question order
-        def extract_question_number(question_id):
-            """Extract question number for sorting"""
-            # Look for numbers in question_id
-            numbers = re.findall(r'\d+', str(question_id))
-            return int(numbers[0]) if numbers else 999
-        
-        enhanced_responses.sort(key=lambda x: (
-            x['participant_id'], 
-            int(x['round']), 
-            extract_question_number(x['question_id']),
-            x['question_id']
-        ))
-        
-        # Write to CSV
-        fieldnames = ['session_id', 'participant_id', 'round', 'question_id', 'answer', 'reason', 'summary', 'prompt']
-        
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(enhanced_responses)
-        
-        if enhanced_responses:
-            logger.info(f"Successfully wrote {len(enhanced_responses)} enhanced responses to {csv_file}")
+        if csv_file.endswith(SQLITE_EXTENSIONS):
+            n_responses = write_responses_to_sqlite(response_batches, csv_file)
+        else:
+            n_responses = 0
+            with open(csv_file, 'w', newline='', encoding='utf-8', buffering=CSV_WRITE_BUFFER) as f:
+                writer = csv.writer(f)
+                writer.writerow(RESPONSE_FIELDNAMES)
+                for batch in response_batches:
+                    writer.writerows(batch)
+                    n_responses += len(batch)
+        
+        if n_responses:
+            logger.info(f"Successfully wrote {n_responses} enhanced responses to {csv_file}")
         else:
             logger.warning(f"No enhanced responses found for session {session_id}")
         
@@ -273,32 +436,61 @@ def export_response_data(csv_file, botex_db, session_id):
     except Exception as e:
         logger.error(f"Error in export_response_data: {str(e)}")
         
+        # botex's standard export only writes CSV, so for SQLite output it goes to a
+        # sibling .csv file rather than overwriting the database with CSV text
+        use_sqlite = csv_file.endswith(SQLITE_EXTENSIONS)
+        fallback_file = str(Path(csv_file).with_suffix('.csv')) if use_sqlite else csv_file
+        
         # Fallback to standard export
         try:
             logger.info(f"Trying standard botex export function...")
             botex.export_response_data(
-                csv_file,
+                fallback_file,
                 botex_db=botex_db,
                 session_id=session_id
             )
-            logger.info(f"Standard export successful")
+            logger.info(f"Standard export successful, written to {fallback_file}")
 
         except Exception as e2:
             logger.warning(f"Standard export also failed: {str(e2)}")
-            fieldnames = ['session_id', 'participant_id', 'round', 'question_id', 'answer', 'reason', 'summary', 'prompt']
-            with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerow({
-                    'session_id': session_id or 'unknown',
-                    'participant_id': 'error',
-                    'round': 1,
-                    'question_id': 'export_error',
-                    'answer': f'Export failed: {str(e)}',
-                    'reason': 'System error during data export',
-                    'summary': 'Error occurred during data export process',
-                    'prompt': 'N/A'
-                })
+            error_row = (
+                session_id or 'unknown',
+                'error',
+                1,
+                'export_error',
+                f'Export failed: {str(e)}',
+                'System error during data export',
+                'Error occurred during data export process',
+                'N/A'
+            )
+            if use_sqlite:
+                write_responses_to_sqlite([[error_row]], csv_file)
+            else:
+                with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+                    # csv.writer still handles quoting of the error message
+                    csv.writer(f).writerows((RESPONSE_FIELDNAMES, error_row))
+
+
+def is_port_open(url, timeout=0.5):
+    """Check whether anything accepts TCP connections at the URL's host and port"""
+    parsed = urlparse(url)
+    port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+    try:
+        with socket.create_connection((parsed.hostname or 'localhost', port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def chrome_available():
+    """Check once whether Google Chrome is installed on macOS"""
+    if platform.system() != 'Darwin':
+        return False
+    return any(
+        (apps_dir / "Google Chrome.app").exists()
+        for apps_dir in (Path("/Applications"), Path.home() / "Applications")
+    )
 
 
 def open_chrome_browser(url, max_attempts=5):
@@ -307,19 +499,20 @@ def open_chrome_browser(url, max_attempts=5):
     for attempt in range(max_attempts):
         try:
             # macOS-specific approach for Chrome
-            if platform.system() == 'Darwin':
+            if chrome_available():
                 try:
                     # Try to use Google Chrome specifically
-                    subprocess.run(['open', '-a', 'Google Chrome', url], check=True)
+                    subprocess.run(['open', '-a', 'Google Chrome', url], check=True,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                     logger.info(f"Opened Chrome with URL: {url}")
                     return True
                 except subprocess.CalledProcessError:
-                    # Fall back to default browser if Chrome isn't available
+                    # Fall back to default browser if Chrome can't be launched
                     webbrowser.open(url)
                     logger.info(f"Opened default browser with URL: {url}")
                     return True
             else:
-                # For other platforms use the webbrowser module
+                # Without Chrome on macOS, or on other platforms, use the webbrowser module
                 webbrowser.open(url)
                 logger.info(f"Opened browser with URL: {url}")
                 return True
@@ -333,6 +526,109 @@ def open_chrome_browser(url, max_attempts=5):
     return False
 
 
+def wait_for_participants(args, session_number, otree_session_id, is_human):
+    """Block until every participant in the oTree session has finished
+    
+    Polls the oTree REST API, backing off while nothing changes.
+    
+    Args:
+        args: Parsed command-line arguments (otree_url, otree_rest_key)
+        session_number: Session number used in log messages
+        otree_session_id: oTree session code to poll
+        is_human: List of booleans, one per participant, in participant order
+        
+    Returns:
+        bool: True if all participants completed, False if the wait was interrupted
+    """
+    otree_url = args.otree_url
+    otree_rest_key = getattr(args, 'otree_rest_key', None)
+    poll_interval = POLL_INTERVAL_MIN
+    previous_state = {}
+    connection_failures = 0
+    # Check immediately so an already-finished session doesn't pay a full poll interval
+    first_check = True
+    # Reuse one keep-alive connection to oTree for every poll
+    with requests.Session() as http:
+        while True:
+            try:
+                if not first_check:
+                    time.sleep(poll_interval)
+                first_check = False
+                
+                # Get session status from oTree
+                session_data = botex.call_otree_api(
+                    http.get, 'sessions', otree_session_id,
+                    otree_server_url=otree_url, 
+                    otree_rest_key=otree_rest_key
+                )
+                
+                participants = session_data.get('participants', [])
+                connection_failures = 0
+                
+                # Count completed participants (both human and bot)
+                completed_count = 0
+                human_completed = 0
+                bot_completed = 0
+                state_changed = False
+                
+                for i, p in enumerate(participants):
+                    participant_code = p.get('code', 'unknown')
+                    finished_flag = p.get('finished', False)
+                    current_page = p.get('_current_page_name', 'unknown')
+                    current_app = p.get('_current_app_name', 'unknown')
+                    
+                    # Determine if this participant is human or bot
+                    is_human_participant = is_human[i] if i < len(is_human) else True
+                    participant_type = "HUMAN" if is_human_participant else "BOT"
+                    
+                    if finished_flag:
+                        completed_count += 1
+                        if is_human_participant:
+                            human_completed += 1
+                        else:
+                            bot_completed += 1
+                    
+                    # Only log participants whose state changed since the last poll
+                    state = (finished_flag, current_app, current_page)
+                    if previous_state.get(participant_code) != state:
+                        previous_state[participant_code] = state
+                        state_changed = True
+                        if finished_flag:
+                            logger.info("  %s (%s): COMPLETED", participant_code, participant_type)
+                        else:
+                            logger.info("  %s (%s): IN PROGRESS (%s.%s)",
+                                        participant_code, participant_type, current_app, current_page)
+                
+                if state_changed:
+                    logger.info("Session %s: %d/%d participants completed (%d humans, %d bots)",
+                                session_number, completed_count, len(participants), human_completed, bot_completed)
+                
+                # Only proceed when ALL participants have finished
+                if completed_count >= len(participants) and len(participants) > 0:
+                    logger.info(f"Session {session_number}: All participants completed!")
+                    print(f"All participants have completed the experiment. Proceeding to data export...")
+                    return True
+                
+                # Poll again soon after activity, otherwise back off up to the maximum
+                if state_changed:
+                    poll_interval = POLL_INTERVAL_MIN
+                else:
+                    poll_interval = min(poll_interval * 2, POLL_INTERVAL_MAX)
+                    
+            except KeyboardInterrupt:
+                logger.info(f"Session {session_number}: Manual interruption - proceeding to data export")
+                print(f"Manual interruption. Exporting current data...")
+                return False
+            except (requests.ConnectionError, requests.Timeout) as connection_error:
+                # Transient while oTree restarts or the network blips; warn once per outage
+                connection_failures += 1
+                log = logger.warning if connection_failures == 1 else logger.debug
+                log("Session %s: oTree server not reachable: %s", session_number, connection_error)
+            except Exception as api_error:
+                logger.warning("Session %s: Could not check session status: %s", session_number, api_error)
+                # Continue waiting
+
+
 def run_session(args, session_number, player_models, player_roles, is_human_list, available_models):
     """Run a single experimental session using app-specific configuration with per-player roles"""
     try:
@@ -358,8 +654,15 @@ def run_session(args, session_number, player_models, player_roles, is_human_list
         
         logger.info(f"Session {session_number}: Output directory: {output_dir}")
         
+        # Load the app's prompts module once and reuse it for every bot in the session
+        try:
+            prompts_module = load_prompts_module(args.app)
+        except Exception as e:
+            logger.error(f"Session {session_number}: Error loading prompts module for app '{args.app}': {str(e)}")
+            prompts_module = None
+        
         # Get available roles for this app
-        available_app_roles = get_available_app_roles(args.app)
+        available_app_roles = get_available_app_roles(args.app, prompts_module)
         logger.info(f"Session {session_number}: Available roles for app '{args.app}': {available_app_roles}")
         
         # Validate player roles
@@ -404,19 +707,29 @@ def run_session(args, session_number, player_models, player_roles, is_human_list
         otree_session_id = session['session_id']
         logger.info(f"Session {session_number}: Initialized oTree session with ID: {otree_session_id}")
 
-        # Log the explicit assignments for verification
-        if player_models:
+        # Precompute player positions once; human_urls and bot_urls follow this order
+        human_player_ids = [i + 1 for i, is_human in enumerate(session['is_human']) if is_human]
+        bot_player_ids = [i + 1 for i, is_human in enumerate(session['is_human']) if not is_human]
+        model_info_by_player = {
+            player_id: available_models[player_models[player_id]]
+            for player_id in bot_player_ids if player_id in player_models
+        }
+
+        # Log the explicit assignments for verification (the whole loop only feeds INFO logs)
+        if player_models and logger.isEnabledFor(logging.INFO):
             for i, is_human in enumerate(session['is_human']):
                 player_position = i + 1
                 participant_code = session['participant_code'][i]
                 if is_human:
                     role_info = f" (role: {player_roles.get(player_position, 'none')})" if player_position in player_roles else ""
-                    logger.info(f"Session {session_number}: Player {player_position} (participant {participant_code}) -> HUMAN{role_info}")
+                    logger.info("Session %s: Player %d (participant %s) -> HUMAN%s",
+                                session_number, player_position, participant_code, role_info)
                 else:
                     if player_position in player_models:
                         assigned_model = player_models[player_position]
                         role_info = f" (role: {player_roles.get(player_position, 'default')})" if player_position in player_roles else " (role: default)"
-                        logger.info(f"Session {session_number}: Player {player_position} (participant {participant_code}) -> {assigned_model}{role_info}")
+                        logger.info("Session %s: Player %d (participant %s) -> %s%s",
+                                    session_number, player_position, participant_code, assigned_model, role_info)
 
         # Get the monitor URL and open browser
         monitor_url = f"{args.otree_url}/SessionMonitor/{otree_session_id}"
@@ -425,17 +738,9 @@ def run_session(args, session_number, player_models, player_roles, is_human_list
         # Display session info
         if session['human_urls']:
             print(f"\nSession {session_number}: Human participant URLs:")
-            for i, url in enumerate(session['human_urls'], 1):
-                # Find the player position for this human
-                human_count = 0
-                for j, is_human in enumerate(session['is_human']):
-                    if is_human:
-                        human_count += 1
-                        if human_count == i:
-                            player_position = j + 1
-                            role_info = f" (role: {player_roles.get(player_position, 'none')})" if player_position in player_roles else ""
-                            print(f"  Player {player_position}: {url}{role_info}")
-                            break
+            for player_position, url in zip(human_player_ids, session['human_urls']):
+                role_info = f" (role: {player_roles.get(player_position, 'none')})" if player_position in player_roles else ""
+                print(f"  Player {player_position}: {url}{role_info}")
         
         if session['bot_urls']:
             role_summary = f" with per-player roles" if player_roles else ""
@@ -443,45 +748,46 @@ def run_session(args, session_number, player_models, player_roles, is_human_list
             
             # Show bot role assignments
             if player_roles:
-                bot_count = 0
-                for i, is_human in enumerate(session['is_human']):
-                    if not is_human:
-                        bot_count += 1
-                        player_position = i + 1
-                        if player_position in player_models:
-                            model_name = player_models[player_position]
-                            role = player_roles.get(player_position, 'default')
-                            print(f"    Bot {bot_count} (Player {player_position}): {model_name} with role '{role}'")
+                for bot_count, player_position in enumerate(bot_player_ids, 1):
+                    if player_position in player_models:
+                        model_name = player_models[player_position]
+                        role = player_roles.get(player_position, 'default')
+                        print(f"    Bot {bot_count} (Player {player_position}): {model_name} with role '{role}'")
         
         if n_bots == 0:
             print(f"\nSession {session_number}: All {len(is_human_list)} participants are human")
         
         print(f"Monitor progress at: {monitor_url}")
         
-        # Automatically open Chrome with the monitor URL (unless disabled)
+        # Automatically open Chrome with the monitor URL (unless disabled), in the
+        # background so bot dispatch doesn't wait on the browser launching
         if not getattr(args, 'no_browser', False):
-            open_chrome_browser(monitor_url)
+            Thread(target=open_chrome_browser, args=(monitor_url,), daemon=True).start()
         
         # Run bots if there are any
         if session['bot_urls']:
             logger.info(f"Session {session_number}: Running bots with app-specific prompts and per-player roles")
             
             # Start llama.cpp server if any local models are used
-            use_local_model = any(available_models[player_models[player_id]]['provider'] == 'local' 
-                                  for player_id in range(1, len(is_human_list) + 1) 
-                                  if player_id in player_models and not session['is_human'][player_id - 1])
+            use_local_model = any(model_info['provider'] == 'local' for model_info in model_info_by_player.values())
             
             server_process = None
             if use_local_model:
                 logger.info(f"Session {session_number}: Starting llama.cpp server for local models")
                 server_url = getattr(args, 'server_url', None) or "http://localhost:8080"
                 
-                try:
-                    response = requests.get(f"{server_url}/health", timeout=5)
-                    if response.status_code != 200:
-                        raise Exception("Server not running")
+                # Cheap TCP probe first; only confirm with /health if something is listening
+                server_running = False
+                if is_port_open(server_url):
+                    try:
+                        response = requests.get(f"{server_url}/health", timeout=5)
+                        server_running = response.status_code == 200
+                    except requests.RequestException:
+                        pass
+                
+                if server_running:
                     logger.info(f"Session {session_number}: llama.cpp server already running at {server_url}")
-                except:
+                else:
                     server_process = botex.start_llamacpp_server({
                         "server_path": getattr(args, 'server_path', None),
                         "local_llm_path": getattr(args, 'model_path', None),
@@ -491,88 +797,90 @@ def run_session(args, session_number, player_models, player_roles, is_human_list
                     })
                     logger.info(f"Session {session_number}: llama.cpp server started")
             
-            # Run bots in parallel threads with assigned models and roles
-            bot_threads = []
-            bot_idx = 0
+            # Run bots in parallel threads with assigned models and roles.
+            # Every bot needs its own worker: grouped games block on WaitPages
+            # until all group members arrive, so a smaller pool could deadlock.
+            bot_futures = {}
+            
+            # Resolve each provider's API key once, not once per bot
+            api_keys = {
+                model_info['api_key_env']: os.environ.get(model_info['api_key_env'])
+                for model_info in model_info_by_player.values() if model_info['api_key_env']
+            }
 
-            for i, is_human in enumerate(session['is_human']):
-                if not is_human:
-                    player_id = i + 1
-                    url = session['bot_urls'][bot_idx]
-                    bot_idx += 1
-                    
-                    if player_id in player_models:
-                        model_name = player_models[player_id]
-                        model_info = available_models[model_name]
-                        player_role = player_roles.get(player_id, None)
-                        
-                        # Log bot assignment attempt
-                        role_info = f" with role '{player_role}'" if player_role else " with default role"
-                        logger.info(f"🔄 ATTEMPTING TO ASSIGN: Player {player_id} → {model_name}{role_info}")
-                        
-                        try:
-                            api_key = None
-                            if model_info['api_key_env']:
-                                api_key = os.environ.get(model_info['api_key_env'])
+            try:
+                with ThreadPoolExecutor(max_workers=max(len(session['bot_urls']), 1)) as bot_pool:
+                    for player_id, url in zip(bot_player_ids, session['bot_urls']):
+                        if player_id in model_info_by_player:
+                            model_name = player_models[player_id]
+                            model_info = model_info_by_player[player_id]
+                            player_role = player_roles.get(player_id, None)
                             
-                            # Load player-specific prompts with better fallback logic
-                            user_prompts = None
+                            # Log bot assignment attempt
+                            role_info = f" with role '{player_role}'" if player_role else " with default role"
+                            logger.info("🔄 ATTEMPTING TO ASSIGN: Player %d → %s%s", player_id, model_name, role_info)
                             
-                            # Try role-specific prompts first
-                            if player_role:
-                                user_prompts = load_app_prompts(args.app, player_role)
+                            try:
+                                api_key = api_keys.get(model_info['api_key_env'])
+                                
+                                # Load player-specific prompts with better fallback logic
+                                user_prompts = None
+                                
+                                # Try role-specific prompts first
+                                if player_role:
+                                    user_prompts = load_app_prompts(args.app, player_role, prompts_module)
+                                    if user_prompts is None:
+                                        logger.warning(f"Failed to load role-specific prompts for player {player_id} (role: {player_role}), trying default")
+                                
+                                # Fall back to default prompts if role-specific failed or no role assigned
                                 if user_prompts is None:
-                                    logger.warning(f"Failed to load role-specific prompts for player {player_id} (role: {player_role}), trying default")
-                            
-                            # Fall back to default prompts if role-specific failed or no role assigned
-                            if user_prompts is None:
-                                user_prompts = load_app_prompts(args.app, None)
-                            
-                            # Final fallback - create basic prompts if all else fails
-                            if user_prompts is None:
-                                logger.warning(f"No app-specific prompts found for {args.app}, using basic prompts")
-                                user_prompts = {
-                                    "system": "You are participating in an experiment. Always respond in valid JSON format only.",
-                                    "analyze_page_q": "Page content: {body}\nQuestions: {questions_json}\nRespond with valid JSON only."
-                                }
-                            
-                            if model_info['provider'] == 'local':
-                                modified_prompts, tinyllama_params = configure_tinyllama_params(args, user_prompts)
-                                user_prompts = modified_prompts
-                            
-                            # IMPORTANT: Use run_bot directly instead of run_single_bot to avoid duplicate insertion
-                            thread = Thread(
-                                target=botex.run_bot,
-                                kwargs={
-                                    'url': url,
-                                    'session_id': otree_session_id,
-                                    'botex_db': botex_db,
-                                    'model': model_info['full_name'],
-                                    'api_key': api_key,
-                                    'user_prompts': user_prompts,
-                                    'temperature': args.temperature,
-                                    'max_tokens': args.max_tokens,
-                                    'throttle': not args.no_throttle,
-                                    'full_conv_history': False
-                                }
-                            )
-                            bot_threads.append(thread)
-                            thread.start()
-                            
-                            logger.info(f"✅ BOT STARTED: Player {player_id} with {model_name}{role_info}")
-                            
+                                    user_prompts = load_app_prompts(args.app, None, prompts_module)
+                                
+                                # Final fallback - create basic prompts if all else fails
+                                if user_prompts is None:
+                                    logger.warning(f"No app-specific prompts found for {args.app}, using basic prompts")
+                                    user_prompts = {
+                                        "system": "You are participating in an experiment. Always respond in valid JSON format only.",
+                                        "analyze_page_q": "Page content: {body}\nQuestions: {questions_json}\nRespond with valid JSON only."
+                                    }
+                                
+                                if model_info['provider'] == 'local':
+                                    modified_prompts, tinyllama_params = configure_tinyllama_params(args, user_prompts)
+                                    user_prompts = modified_prompts
+                                
+                                # IMPORTANT: Use run_bot directly instead of run_single_bot to avoid duplicate insertion
+                                future = bot_pool.submit(
+                                    botex.run_bot,
+                                    url=url,
+                                    session_id=otree_session_id,
+                                    botex_db=botex_db,
+                                    model=model_info['full_name'],
+                                    api_key=api_key,
+                                    user_prompts=user_prompts,
+                                    temperature=args.temperature,
+                                    max_tokens=args.max_tokens,
+                                    throttle=not args.no_throttle,
+                                    full_conv_history=False
+                                )
+                                bot_futures[future] = player_id
+                                
+                                logger.info("✅ BOT STARTED: Player %d with %s%s", player_id, model_name, role_info)
+                                
+                            except Exception as e:
+                                logger.error(f"❌ BOT ASSIGNMENT FAILED: Player {player_id} → {model_name}{role_info} - Error: {str(e)}")
+                                # Continue with other bots even if this one fails
+                
+                    # Wait for all bots to finish, surfacing failures as they happen
+                    for future in as_completed(bot_futures):
+                        try:
+                            future.result()
                         except Exception as e:
-                            logger.error(f"❌ BOT ASSIGNMENT FAILED: Player {player_id} → {model_name}{role_info} - Error: {str(e)}")
-                            # Continue with other bots even if this one fails
-            
-            # Wait for all bots to finish
-            for thread in bot_threads:
-                thread.join()
-            
-            # Clean up llama.cpp server if we started it
-            if server_process is not None:
-                logger.info(f"Session {session_number}: Stopping llama.cpp server")
-                botex.stop_llamacpp_server(server_process)
+                            logger.error(f"❌ BOT FAILED: Player {bot_futures[future]} - Error: {str(e)}")
+            finally:
+                # Clean up llama.cpp server if we started it
+                if server_process is not None:
+                    logger.info(f"Session {session_number}: Stopping llama.cpp server")
+                    botex.stop_llamacpp_server(server_process)
             
             logger.info(f"Session {session_number}: Bots completed")
         
@@ -585,65 +893,7 @@ def run_session(args, session_number, player_models, player_roles, is_human_list
             print(f"Press Ctrl+C to stop early and export current data.\n")
             
             try:
-                # Wait for human participants to complete
-                while True:
-                    try:
-                        time.sleep(20)  # Check every 20 seconds
-                        
-                        # Get session status from oTree
-                        session_data = botex.call_otree_api(
-                            requests.get, 'sessions', otree_session_id,
-                            otree_server_url=args.otree_url, 
-                            otree_rest_key=getattr(args, 'otree_rest_key', None)
-                        )
-                        
-                        participants = session_data.get('participants', [])
-                        
-                        # Count completed participants (both human and bot)
-                        completed_count = 0
-                        human_completed = 0
-                        bot_completed = 0
-                        
-                        for i, p in enumerate(participants):
-                            participant_code = p.get('code', 'unknown')
-                            finished_flag = p.get('finished', False)
-                            current_page = p.get('_current_page_name', 'unknown')
-                            current_app = p.get('_current_app_name', 'unknown')
-                            
-                            # Determine if this participant is human or bot
-                            is_human_participant = session['is_human'][i] if i < len(session['is_human']) else True
-                            
-                            if finished_flag:
-                                completed_count += 1
-                                if is_human_participant:
-                                    human_completed += 1
-                                    logger.info(f"  {participant_code} (HUMAN): COMPLETED")
-                                else:
-                                    bot_completed += 1
-                                    logger.info(f"  {participant_code} (BOT): COMPLETED")
-                            else:
-                                if is_human_participant:
-                                    logger.info(f"  {participant_code} (HUMAN): IN PROGRESS ({current_app}.{current_page})")
-                                else:
-                                    logger.info(f"  {participant_code} (BOT): IN PROGRESS ({current_app}.{current_page})")
-                        
-                        logger.info(f"Session {session_number}: {completed_count}/{len(participants)} participants completed "
-                                   f"({human_completed} humans, {bot_completed} bots)")
-                        
-                        # Only proceed when ALL participants have finished
-                        if completed_count >= len(participants) and len(participants) > 0:
-                            logger.info(f"Session {session_number}: All participants completed!")
-                            print(f"All participants have completed the experiment. Proceeding to data export...")
-                            break
-                            
-                    except KeyboardInterrupt:
-                        logger.info(f"Session {session_number}: Manual interruption - proceeding to data export")
-                        print(f"Manual interruption. Exporting current data...")
-                        break
-                    except Exception as api_error:
-                        logger.warning(f"Session {session_number}: Could not check session status: {str(api_error)}")
-                        # Continue waiting
-                        
+                wait_for_participants(args, session_number, otree_session_id, session['is_human'])
             except Exception as e:
                 logger.error(f"Session {session_number}: Error while waiting for completion: {str(e)}")
                 print(f"Error while waiting. Proceeding to data export...")
@@ -654,57 +904,73 @@ def run_session(args, session_number, player_models, player_roles, is_human_list
         # Export data using botex standard functions with comprehensive coverage
         logger.info(f"Session {session_number}: Exporting comprehensive data...")
 
-        # Export oTree wide data
+        # Read once per session: botex.env is only loaded (by load_env) after this module is imported,
+        # so this cannot be a module-level constant
+        otree_admin_password = os.environ.get('OTREE_ADMIN_PASSWORD')
+
+        # Output paths for this session's exports
         otree_wide_csv = os.path.join(output_dir, f"otree_{otree_session_id}_wide{model_suffix}.csv")
-        try:
-            botex.export_otree_data(
-                otree_wide_csv,
-                server_url=args.otree_url,
-                admin_name='admin',
-                admin_password=os.environ.get('OTREE_ADMIN_PASSWORD')
-            )
-            logger.info(f"Session {session_number}: oTree wide data exported")
-        except Exception as e:
-            logger.error(f"Session {session_number}: Failed to export oTree wide data: {str(e)}")
+        normalized_prefix = f"otree_{otree_session_id}{model_suffix}"
+        participants_csv = os.path.join(output_dir, f"botex_{otree_session_id}_participants{model_suffix}.csv")
+        responses_csv = os.path.join(output_dir, f"botex_{otree_session_id}_responses{model_suffix}.csv")
+        summary_file = os.path.join(output_dir, f"data_export_summary_{otree_session_id}{model_suffix}.txt")
 
-        # Normalize oTree data to get all levels (session, participant, group, player)
-        try:
-            normalized_data = botex.normalize_otree_data(
-                otree_wide_csv, 
-                store_as_csv=True,
-                data_exp_path=output_dir,
-                exp_prefix=f"otree_{otree_session_id}{model_suffix}"
-            )
-            logger.info(f"Session {session_number}: oTree data normalized into separate files")
-            
-            # Log what data files were created
-            expected_files = ['session', 'participant', 'group', 'player']
-            for data_type in expected_files:
-                file_path = os.path.join(output_dir, f"otree_{otree_session_id}{model_suffix}_{data_type}.csv")
-                if os.path.exists(file_path):
-                    logger.info(f"  ✓ Created {data_type} data: {file_path}")
-                else:
-                    logger.warning(f"  ✗ Missing {data_type} data file")
-                    
-        except Exception as e:
-            logger.warning(f"Session {session_number}: Data normalization warning: {str(e)}")
+        # The oTree export/normalize chain and the two botex exports are independent,
+        # so run them concurrently; each task logs its own failures
+        def export_otree_levels():
+            # Export oTree wide data
+            try:
+                botex.export_otree_data(
+                    otree_wide_csv,
+                    server_url=args.otree_url,
+                    admin_name='admin',
+                    admin_password=otree_admin_password
+                )
+                logger.info(f"Session {session_number}: oTree wide data exported")
+            except Exception as e:
+                logger.error(f"Session {session_number}: Failed to export oTree wide data: {str(e)}")
 
-        # Export botex data if there were bots
-        if n_bots > 0:
+            # Normalize oTree data to get all levels (session, participant, group, player)
+            try:
+                normalized_data = botex.normalize_otree_data(
+                    otree_wide_csv, 
+                    store_as_csv=True,
+                    data_exp_path=output_dir,
+                    exp_prefix=normalized_prefix
+                )
+                logger.info(f"Session {session_number}: oTree data normalized into separate files")
+                
+                # Log what data files were created
+                expected_files = ['session', 'participant', 'group', 'player']
+                name_prefix = f"{normalized_prefix}_"
+                file_prefix = os.path.join(output_dir, name_prefix)
+                # One directory scan instead of a stat per expected file
+                present_files = {entry.name for entry in os.scandir(output_dir)}
+                for data_type in expected_files:
+                    if f"{name_prefix}{data_type}.csv" in present_files:
+                        logger.info(f"  ✓ Created {data_type} data: {file_prefix}{data_type}.csv")
+                    else:
+                        logger.warning(f"  ✗ Missing {data_type} data file")
+                        
+            except Exception as e:
+                logger.warning(f"Session {session_number}: Data normalization warning: {str(e)}")
+
+        def export_bot_participants():
             try:
                 botex.export_participant_data(
-                    os.path.join(output_dir, f"botex_{otree_session_id}_participants{model_suffix}.csv"),
+                    participants_csv,
                     botex_db=botex_db,
                     session_id=otree_session_id
                 )
                 logger.info(f"Session {session_number}: Botex participant data exported")
             except Exception as e:
                 logger.warning(f"Session {session_number}: Could not export botex participant data: {str(e)}")
-            
+
+        def export_bot_responses():
             try:
                 # Use enhanced export function
                 export_response_data(
-                    os.path.join(output_dir, f"botex_{otree_session_id}_responses{model_suffix}.csv"),
+                    responses_csv,
                     botex_db=botex_db,
                     session_id=otree_session_id
                 )
@@ -712,37 +978,53 @@ def run_session(args, session_number, player_models, player_roles, is_human_list
             except Exception as e:
                 logger.warning(f"Session {session_number}: Error exporting enhanced botex responses: {str(e)}")
 
+        export_tasks = [export_otree_levels]
+        # Export botex data if there were bots
+        if n_bots > 0:
+            export_tasks.extend((export_bot_participants, export_bot_responses))
+
+        with ThreadPoolExecutor(max_workers=len(export_tasks)) as export_pool:
+            for future in as_completed([export_pool.submit(task) for task in export_tasks]):
+                future.result()
+
         # Create comprehensive data summary
-        summary_file = os.path.join(output_dir, f"data_export_summary_{otree_session_id}{model_suffix}.txt")
+        # Build the summary in memory and hand it to the file in one call
+        summary_lines = []
+        add_line = summary_lines.append
+        add_line(f"Data Export Summary - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        add_line("="*70 + "\n\n")
+        
+        add_line("FILES EXPORTED:\n")
+        add_line("-" * 20 + "\n")
+        
+        # List all files in output directory (DirEntry caches its stat result)
+        csv_entries = sorted(
+            (entry for entry in os.scandir(output_dir) if entry.name.endswith('.csv')),
+            key=lambda entry: entry.name
+        )
+        for entry in csv_entries:
+            add_line(f"  {entry.name} ({entry.stat().st_size:,} bytes)\n")
+        
+        add_line(f"\nEXPERIMENT DETAILS:\n")
+        add_line("-" * 20 + "\n")
+        add_line(f"App: {args.app}\n")
+        add_line(f"Session ID: {otree_session_id}\n")
+        add_line(f"Total Participants: {len(is_human_list)}\n")
+        add_line(f"Human Participants: {n_humans_actual}\n")
+        add_line(f"Bot Participants: {n_bots}\n")
+        
+        if player_roles:
+            add_line(f"\nROLE ASSIGNMENTS:\n")
+            add_line("-" * 20 + "\n")
+            is_human_flags = tuple(session['is_human'])
+            summary_lines.extend(
+                f"  Player {player_id}: {role} (HUMAN)\n" if is_human_flags[player_id - 1]
+                else f"  Player {player_id}: {role} (BOT) ({player_models.get(player_id, 'N/A')})\n"
+                for player_id, role in player_roles.items()
+            )
+
         with open(summary_file, 'w') as f:
-            f.write(f"Data Export Summary - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("="*70 + "\n\n")
-            
-            f.write("FILES EXPORTED:\n")
-            f.write("-" * 20 + "\n")
-            
-            # List all files in output directory
-            for file_name in sorted(os.listdir(output_dir)):
-                if file_name.endswith('.csv'):
-                    file_path = os.path.join(output_dir, file_name)
-                    file_size = os.path.getsize(file_path)
-                    f.write(f"  {file_name} ({file_size:,} bytes)\n")
-            
-            f.write(f"\nEXPERIMENT DETAILS:\n")
-            f.write("-" * 20 + "\n")
-            f.write(f"App: {args.app}\n")
-            f.write(f"Session ID: {otree_session_id}\n")
-            f.write(f"Total Participants: {len(is_human_list)}\n")
-            f.write(f"Human Participants: {n_humans_actual}\n")
-            f.write(f"Bot Participants: {n_bots}\n")
-            
-            if player_roles:
-                f.write(f"\nROLE ASSIGNMENTS:\n")
-                f.write("-" * 20 + "\n")
-                for player_id, role in player_roles.items():
-                    participant_type = "HUMAN" if session['is_human'][player_id - 1] else "BOT"
-                    model_info = f" ({player_models.get(player_id, 'N/A')})" if participant_type == "BOT" else ""
-                    f.write(f"  Player {player_id}: {role} ({participant_type}){model_info}\n")
+            f.writelines(summary_lines)
 
         logger.info(f"Session {session_number}: Comprehensive data export completed")
         return {"success": True, "session_id": otree_session_id, "output_dir": output_dir}
@@ -30,6 +30,43 @@ class C(BaseConstants):
     TIE_PAYOFF = 0
 
 
+# Choice letter -> full name, e.g. 'R' -> 'Rock'
+CHOICE_NAMES = dict(C.CHOICES)
+CHOICE_LETTERS = tuple(CHOICE_NAMES)
+
+# (player choice, opponent choice) -> (result, points earned), covering every pair
+OUTCOMES = {
+    ('R', 'R'): ('tie', C.TIE_PAYOFF),
+    ('R', 'P'): ('lose', C.LOSE_PAYOFF),
+    ('R', 'S'): ('win', C.WIN_PAYOFF),
+    ('P', 'R'): ('win', C.WIN_PAYOFF),
+    ('P', 'P'): ('tie', C.TIE_PAYOFF),
+    ('P', 'S'): ('lose', C.LOSE_PAYOFF),
+    ('S', 'R'): ('lose', C.LOSE_PAYOFF),
+    ('S', 'P'): ('win', C.WIN_PAYOFF),
+    ('S', 'S'): ('tie', C.TIE_PAYOFF),
+}
+
+# Payoff values shown on the Instructions and Choice pages
+PAYOFF_VARS = {
+    'win_payoff': C.WIN_PAYOFF,
+    'lose_payoff': C.LOSE_PAYOFF,
+    'tie_payoff': C.TIE_PAYOFF
+}
+
+# Result -> heading and Bootstrap colour class on the Results page
+RESULT_TEXT = {
+    'win': 'You Win!',
+    'lose': 'You Lose!',
+    'tie': "It's a Tie!"
+}
+RESULT_CLASS = {
+    'win': 'success',
+    'lose': 'danger',
+    'tie': 'warning'
+}
+
+
 class Subsession(BaseSubsession):
     pass
 
@@ -68,31 +105,15 @@ class Player(BasePlayer):
     
     def set_opponent_choice(self):
         """Randomly determine opponent's choice"""
-        self.opponent_choice = random.choice(['R', 'P', 'S'])
+        self.opponent_choice = random.choice(CHOICE_LETTERS)
     
     def determine_result(self):
         """Determine game result and points earned"""
-        player_choice = self.choice
-        opponent_choice = self.opponent_choice
-        
-        if player_choice == opponent_choice:
-            self.result = 'tie'
-            self.points_earned = C.TIE_PAYOFF
-        elif (
-            (player_choice == 'R' and opponent_choice == 'S') or
-            (player_choice == 'P' and opponent_choice == 'R') or
-            (player_choice == 'S' and opponent_choice == 'P')
-        ):
-            self.result = 'win'
-            self.points_earned = C.WIN_PAYOFF
-        else:
-            self.result = 'lose'
-            self.points_earned = C.LOSE_PAYOFF
+        self.result, self.points_earned = OUTCOMES[(self.choice, self.opponent_choice)]
     
     def get_opponent_choice_display(self):
         """Convert opponent choice letter to full name"""
-        choice_map = {'R': 'Rock', 'P': 'Paper', 'S': 'Scissors'}
-        return choice_map.get(self.opponent_choice, self.opponent_choice)
+        return CHOICE_NAMES.get(self.opponent_choice, self.opponent_choice)
 
 
 # PAGES
@@ -108,11 +129,7 @@ class Instructions(Page):
     
     @staticmethod
     def vars_for_template(player):
-        return {
-            'win_payoff': C.WIN_PAYOFF,
-            'lose_payoff': C.LOSE_PAYOFF,
-            'tie_payoff': C.TIE_PAYOFF
-        }
+        return dict(PAYOFF_VARS)
 
 
 class Choice(Page):
@@ -126,11 +143,7 @@ class Choice(Page):
         if not player.strategy:
             player.set_strategy_assignment()
             
-        return {
-            'win_payoff': C.WIN_PAYOFF,
-            'lose_payoff': C.LOSE_PAYOFF,
-            'tie_payoff': C.TIE_PAYOFF
-        }
+        return dict(PAYOFF_VARS)
     
     @staticmethod
     def before_next_page(player, timeout_happened):
@@ -149,16 +162,8 @@ class Results(Page):
         return {
             'player_choice_display': player.get_choice_display(),
             'opponent_choice_display': player.get_opponent_choice_display(),
-            'result_text': {
-                'win': 'You Win!',
-                'lose': 'You Lose!',
-                'tie': "It's a Tie!"
-            }[player.result],
-            'result_class': {
-                'win': 'success',
-                'lose': 'danger', 
-                'tie': 'warning'
-            }[player.result]
+            'result_text': RESULT_TEXT[player.result],
+            'result_class': RESULT_CLASS[player.result]
         }
 
 
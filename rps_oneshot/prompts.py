@@ -8,21 +8,13 @@ Uses the general framework convention with get_prompts() function.
 The specific prompts are those used by Vidler and Walsh (2025) https://arxiv.org/pdf/2503.02582
 """
 
-def get_prompts(role=None):
-    """
-    Get the appropriate prompts for the specified RPS strategy.
-    
-    Args:
-        role (str): One of P1, P2r, P2p, P2s, P3a, P3b, P3c, P4, or None for default
-    
-    Returns:
-        dict: Dictionary containing the prompts for botex
-    """
-    
-    if role == 'P1':
-        return {
-            "system": """You are participating in a Rock Paper Scissors experiment. You must make a single choice when prompted. Always respond in valid JSON format only.""",
-            "analyze_page_q": """You are playing Rock Paper Scissors.
+SYSTEM_PROMPT = """You are participating in a Rock Paper Scissors experiment. You must make a single choice when prompted. Always respond in valid JSON format only."""
+
+# Prompts for each strategy, built once at import
+ROLE_PROMPTS = {
+    'P1': {
+        "system": SYSTEM_PROMPT,
+        "analyze_page_q": """You are playing Rock Paper Scissors.
 
 Page content: {body}
 Questions: {questions_json}
@@ -30,90 +22,83 @@ Questions: {questions_json}
 Rules: (1) Choose: 'R' (Rock), 'P' (Paper), or 'S' (Scissors) (2) Winning conditions: Rock crushes Scissors, Paper covers Rock, Scissors cuts Paper (3) Analyze the game history to identify patterns (4) Only choose a single letter: 'R', 'P', or 'S'
 
 Respond with valid JSON only."""
-        }
+    },
 
-    elif role == 'P2r':
-        return {
-            "system": """You are participating in a Rock Paper Scissors experiment. You must make a single choice when prompted. Always respond in valid JSON format only.""",
-            "analyze_page_q": """You are playing Rock Paper Scissors where winning awards 1 point and losing gives 0 points. Paper beats Rock by covering it, Rock beats Scissors by breaking them, and Scissors beats Paper by cutting it. Matching moves result in a tie where both players get 0 points. The payoffs are written as (Player 1 score, Player 2 score) for each possible combination. Only choose a single letter: R, P, or S
+    'P2r': {
+        "system": SYSTEM_PROMPT,
+        "analyze_page_q": """You are playing Rock Paper Scissors where winning awards 1 point and losing gives 0 points. Paper beats Rock by covering it, Rock beats Scissors by breaking them, and Scissors beats Paper by cutting it. Matching moves result in a tie where both players get 0 points. The payoffs are written as (Player 1 score, Player 2 score) for each possible combination. Only choose a single letter: R, P, or S
 
 Page content: {body}
 Questions: {questions_json}
 
 Respond with valid JSON only."""
-        }
+    },
 
-    elif role == 'P2p':
-        return {
-            "system": """You are participating in a Rock Paper Scissors experiment. You must make a single choice when prompted. Always respond in valid JSON format only.""",
-            "analyze_page_q": """You are playing Rock Paper Scissors where winning awards 1 point and losing gives 0 points. Scissors beats Paper by cutting it, Paper beats Rock by covering it, and Rock beats Scissors by breaking them. Matching moves result in a tie where both players get 0 points. Choose one of: 'P' (Paper), 'S' (Scissors), or 'R' (Rock). Only choose a single letter: P, S, or R
+    'P2p': {
+        "system": SYSTEM_PROMPT,
+        "analyze_page_q": """You are playing Rock Paper Scissors where winning awards 1 point and losing gives 0 points. Scissors beats Paper by cutting it, Paper beats Rock by covering it, and Rock beats Scissors by breaking them. Matching moves result in a tie where both players get 0 points. Choose one of: 'P' (Paper), 'S' (Scissors), or 'R' (Rock). Only choose a single letter: P, S, or R
 
 Page content: {body}
 Questions: {questions_json}
 
 Respond with valid JSON only."""
-        }
+    },
 
-    elif role == 'P2s':
-        return {
-            "system": """You are participating in a Rock Paper Scissors experiment. You must make a single choice when prompted. Always respond in valid JSON format only.""",
-            "analyze_page_q": """You are playing Rock Paper Scissors where winning awards 1 point and losing gives 0 points. Rock beats Scissors by breaking them, Scissors beats Paper by cutting it, and Paper beats Rock by covering it. Matching moves result in a tie where both players get 0 points. Choose one of: 'S' (Scissors), 'R' (Rock), or 'P' (Paper). Only choose a single letter: S, R, or P
+    'P2s': {
+        "system": SYSTEM_PROMPT,
+        "analyze_page_q": """You are playing Rock Paper Scissors where winning awards 1 point and losing gives 0 points. Rock beats Scissors by breaking them, Scissors beats Paper by cutting it, and Paper beats Rock by covering it. Matching moves result in a tie where both players get 0 points. Choose one of: 'S' (Scissors), 'R' (Rock), or 'P' (Paper). Only choose a single letter: S, R, or P
 
 Page content: {body}
 Questions: {questions_json}
 
 Respond with valid JSON only."""
-        }
+    },
 
-    elif role == 'P3a':
-        return {
-            "system": """You are participating in a Rock Paper Scissors experiment. You must make a single choice when prompted. Always respond in valid JSON format only.""",
-            "analyze_page_q": """Make strategic choices based on game patterns and theory. Rules: Choose one of: 'P' (Paper), 'R' (Rock), or 'S' (Scissors). Payoff: Paper beats Rock, Rock beats Scissors, Scissors beats Paper, all other combinations are a tie. Only choose a single letter: P, R, or S
+    'P3a': {
+        "system": SYSTEM_PROMPT,
+        "analyze_page_q": """Make strategic choices based on game patterns and theory. Rules: Choose one of: 'P' (Paper), 'R' (Rock), or 'S' (Scissors). Payoff: Paper beats Rock, Rock beats Scissors, Scissors beats Paper, all other combinations are a tie. Only choose a single letter: P, R, or S
 
 Page content: {body}
 Questions: {questions_json}
 
 Respond with valid JSON only."""
-        }
+    },
 
-    elif role == 'P3b':
-        return {
-            "system": """You are participating in a Rock Paper Scissors experiment. You must make a single choice when prompted. Always respond in valid JSON format only.""",
-            "analyze_page_q": """Make strategic choices based on game patterns and theory. Rules: Randomly choose one of: 'P' (Paper), 'R' (Rock), or 'S' (Scissors). Payoff: Paper beats Rock, Rock beats Scissors, Scissors beats Paper, all other combinations are a tie. Only choose a single letter: P, R, or S
+    'P3b': {
+        "system": SYSTEM_PROMPT,
+        "analyze_page_q": """Make strategic choices based on game patterns and theory. Rules: Randomly choose one of: 'P' (Paper), 'R' (Rock), or 'S' (Scissors). Payoff: Paper beats Rock, Rock beats Scissors, Scissors beats Paper, all other combinations are a tie. Only choose a single letter: P, R, or S
 
 Page content: {body}
 Questions: {questions_json}
 
 Respond with valid JSON only."""
-        }
+    },
 
-    elif role == 'P3c':
-        return {
-            "system": """You are participating in a Rock Paper Scissors experiment. You must make a single choice when prompted. Always respond in valid JSON format only.""",
-            "analyze_page_q": """Make strategic choices based on game patterns and theory. Rules: Randomly choose one of: 'P' (Paper), 'R' (Rock), or 'S' (Scissors). Payoff: Paper beats Rock, Rock beats Scissors, Scissors beats Paper, all other combinations are a tie. The optimal strategy is to randomise your selection of R,P,S. Only choose a single letter: P, R, or S
+    'P3c': {
+        "system": SYSTEM_PROMPT,
+        "analyze_page_q": """Make strategic choices based on game patterns and theory. Rules: Randomly choose one of: 'P' (Paper), 'R' (Rock), or 'S' (Scissors). Payoff: Paper beats Rock, Rock beats Scissors, Scissors beats Paper, all other combinations are a tie. The optimal strategy is to randomise your selection of R,P,S. Only choose a single letter: P, R, or S
 
 Page content: {body}
 Questions: {questions_json}
 
 Respond with valid JSON only."""
-        }
+    },
 
-    elif role == 'P4':
-        return {
-            "system": """You are participating in a Rock Paper Scissors experiment. You must make a single choice when prompted. Always respond in valid JSON format only.""",
-            "analyze_page_q": """You are playing the strategic game called Rock Paper Scissors and you need to choose what your play will be. You can choose one choice from the following list: Rock, Paper or Scissors. Your payoff will depend on the other players choice too: Paper beats Rock and wins 1 point, Scissors beats Paper and wins 1 point, Rock beats Scissors and wins one point, all other combinations, and a tie, win 0. Only choose a single letter: R, P, or S
+    'P4': {
+        "system": SYSTEM_PROMPT,
+        "analyze_page_q": """You are playing the strategic game called Rock Paper Scissors and you need to choose what your play will be. You can choose one choice from the following list: Rock, Paper or Scissors. Your payoff will depend on the other players choice too: Paper beats Rock and wins 1 point, Scissors beats Paper and wins 1 point, Rock beats Scissors and wins one point, all other combinations, and a tie, win 0. Only choose a single letter: R, P, or S
 
 Page content: {body}
 Questions: {questions_json}
 
 Respond with valid JSON only."""
-        }
+    }
+}
 
-    else:
-        # Default strategy - only used when no role is specified
-        return {
-            "system": """You are participating in a Rock Paper Scissors experiment. You must make a single choice when prompted. Always respond in valid JSON format only.""",
-            "analyze_page_q": """You are playing Rock Paper Scissors.
+# Default strategy - only used when no role is specified
+DEFAULT_PROMPTS = {
+    "system": SYSTEM_PROMPT,
+    "analyze_page_q": """You are playing Rock Paper Scissors.
 
 Page content: {body}
 Questions: {questions_json}
@@ -121,7 +106,34 @@ Questions: {questions_json}
 Choose: 'R' (Rock), 'P' (Paper), or 'S' (Scissors). Only choose a single letter: 'R', 'P', or 'S'
 
 Respond with valid JSON only."""
-        }
+}
+
+ROLE_DESCRIPTIONS = {
+    'P1': 'Base prompt with game history analysis',
+    'P2r': 'Rock-first ordering with detailed payoff explanation',
+    'P2p': 'Paper-first ordering with detailed payoff explanation', 
+    'P2s': 'Scissors-first ordering with detailed payoff explanation',
+    'P3a': 'Classic design reworded with strategic emphasis',
+    'P3b': 'Strategic emphasis with random choice instruction',
+    'P3c': 'Strategic emphasis with random choice and optimal strategy advice',
+    'P4': 'Clear points explanation with strategic framing'
+}
+
+AVAILABLE_ROLES = tuple(ROLE_PROMPTS)
+
+
+def get_prompts(role=None):
+    """
+    Get the appropriate prompts for the specified RPS strategy.
+    
+    Args:
+        role (str): One of P1, P2r, P2p, P2s, P3a, P3b, P3c, P4, or None for default
+    
+    Returns:
+        dict: Dictionary containing the prompts for botex
+    """
+    # Copy so callers can't modify the shared table
+    return dict(ROLE_PROMPTS.get(role, DEFAULT_PROMPTS))
 
 
 def get_available_roles():
@@ -129,9 +141,9 @@ def get_available_roles():
     Get list of available roles for this app.
     
     Returns:
-        list: List of available role names
+        tuple: Available role names
     """
-    return ['P1', 'P2r', 'P2p', 'P2s', 'P3a', 'P3b', 'P3c', 'P4']
+    return AVAILABLE_ROLES
 
 
 def get_role_description(role):
@@ -144,14 +156,4 @@ def get_role_description(role):
     Returns:
         str: Human-readable description
     """
-    descriptions = {
-        'P1': 'Base prompt with game history analysis',
-        'P2r': 'Rock-first ordering with detailed payoff explanation',
-        'P2p': 'Paper-first ordering with detailed payoff explanation', 
-        'P2s': 'Scissors-first ordering with detailed payoff explanation',
-        'P3a': 'Classic design reworded with strategic emphasis',
-        'P3b': 'Strategic emphasis with random choice instruction',
-        'P3c': 'Strategic emphasis with random choice and optimal strategy advice',
-        'P4': 'Clear points explanation with strategic framing'
-    }
-    return descriptions.get(role, f'Unknown strategy: {role}')
\ No newline at end of file
+    return ROLE_DESCRIPTIONS.get(role, f'Unknown strategy: {role}')
\ No newline at end of file
@@ -35,16 +35,58 @@ class C(BaseConstants):
     TIE_PAYOFF = 1
 
 
+# Choice letter -> full name, e.g. 'R' -> 'Rock'
+CHOICE_NAMES = dict(C.CHOICES)
+
+# (own choice, opponent choice) -> (result, round payoff), covering every pair
+OUTCOMES = {
+    ('R', 'R'): ('tie', C.TIE_PAYOFF),
+    ('R', 'P'): ('lose', C.LOSE_PAYOFF),
+    ('R', 'S'): ('win', C.WIN_PAYOFF),
+    ('P', 'R'): ('win', C.WIN_PAYOFF),
+    ('P', 'P'): ('tie', C.TIE_PAYOFF),
+    ('P', 'S'): ('lose', C.LOSE_PAYOFF),
+    ('S', 'R'): ('lose', C.LOSE_PAYOFF),
+    ('S', 'P'): ('win', C.WIN_PAYOFF),
+    ('S', 'S'): ('tie', C.TIE_PAYOFF),
+}
+
+# Round-independent values shown on the Choice page
+CHOICE_PAGE_VARS = {
+    'num_rounds': C.NUM_ROUNDS,
+    'total_rounds': C.NUM_ROUNDS,
+    'win_payoff': C.WIN_PAYOFF,
+    'lose_payoff': C.LOSE_PAYOFF,
+    'tie_payoff': C.TIE_PAYOFF
+}
+
+# Result -> heading and Bootstrap colour class on the Results page
+RESULT_TEXT = {
+    'win': 'You Win!',
+    'lose': 'You Lose!',
+    'tie': "It's a Tie!"
+}
+RESULT_CLASS = {
+    'win': 'success',
+    'lose': 'danger',
+    'tie': 'warning'
+}
+
+# Overall result -> heading on the FinalResults page (classes match RESULT_CLASS)
+OVERALL_RESULT_TEXT = {
+    'win': 'You Won Overall!',
+    'lose': 'You Lost Overall!',
+    'tie': 'Overall Tie!'
+}
+
+
 class Subsession(BaseSubsession):
     def creating_session(self):
         # Use matrix grouping
         if self.round_number == 1:
-            # Group players into pairs
-            matrix = []
+            # Group players into consecutive pairs (an odd trailing player is left out)
             players = self.get_players()
-            for i in range(0, len(players), 2):
-                if i + 1 < len(players):
-                    matrix.append([players[i], players[i + 1]])
+            matrix = [list(pair) for pair in zip(players[0::2], players[1::2])]
             self.set_group_matrix(matrix)
         else:
             # Keep same groups across rounds
@@ -57,31 +99,8 @@ class Group(BaseGroup):
         players = self.get_players()
         p1, p2 = players[0], players[1]
         
-        p1_choice = p1.choice
-        p2_choice = p2.choice
-        
-        if p1_choice == p2_choice:
-            # Tie
-            p1.round_payoff = C.TIE_PAYOFF
-            p2.round_payoff = C.TIE_PAYOFF
-            p1.result = 'tie'
-            p2.result = 'tie'
-        elif (
-            (p1_choice == 'R' and p2_choice == 'S') or
-            (p1_choice == 'P' and p2_choice == 'R') or
-            (p1_choice == 'S' and p2_choice == 'P')
-        ):
-            # Player 1 wins
-            p1.round_payoff = C.WIN_PAYOFF
-            p2.round_payoff = C.LOSE_PAYOFF
-            p1.result = 'win'
-            p2.result = 'lose'
-        else:
-            # Player 2 wins
-            p1.round_payoff = C.LOSE_PAYOFF
-            p2.round_payoff = C.WIN_PAYOFF
-            p1.result = 'lose'
-            p2.result = 'win'
+        p1.result, p1.round_payoff = OUTCOMES[(p1.choice, p2.choice)]
+        p2.result, p2.round_payoff = OUTCOMES[(p2.choice, p1.choice)]
 
 
 class Player(BasePlayer):
@@ -135,10 +154,10 @@ class Player(BasePlayer):
         if hasattr(self.participant, 'strategy'):
             self.strategy = self.participant.strategy
     
-    def choice_display_text(self, choice_letter):
+    @staticmethod
+    def choice_display_text(choice_letter):
         """Convert choice letter to full name - renamed to avoid conflict with oTree's get_choice_display()"""
-        choice_map = {'R': 'Rock', 'P': 'Paper', 'S': 'Scissors'}
-        return choice_map.get(choice_letter, choice_letter)
+        return CHOICE_NAMES.get(choice_letter, choice_letter)
     
     def get_opponent(self):
         """Get the other player in the group"""
@@ -146,13 +165,15 @@ class Player(BasePlayer):
     
     def get_total_payoff(self):
         """Calculate total payoff across all rounds"""
-        return sum([p.round_payoff for p in self.in_all_rounds()])
+        return sum(p.round_payoff for p in self.in_all_rounds())
     
     def get_round_history(self):
         """Get history of choices and results for previous rounds with full choice names"""
         history = []
-        for round_player in self.in_previous_rounds():
-            opponent = round_player.get_opponent()
+        # Groups are fixed across rounds (group_like_round), so fetch the opponent's
+        # rounds in one query instead of resolving the opponent again for every round
+        opponent_rounds = self.get_opponent().in_previous_rounds()
+        for round_player, opponent in zip(self.in_previous_rounds(), opponent_rounds):
             history.append({
                 'round': round_player.round_number,
                 'my_choice': self.choice_display_text(round_player.choice),
@@ -201,21 +222,15 @@ class Choice(Page):
             
         history = player.get_round_history()
         return {
-            'num_rounds': C.NUM_ROUNDS,
-            'win_payoff': C.WIN_PAYOFF,
-            'lose_payoff': C.LOSE_PAYOFF,
-            'tie_payoff': C.TIE_PAYOFF,
+            **CHOICE_PAGE_VARS,
             'round_number': player.round_number,
-            'total_rounds': C.NUM_ROUNDS,
             'history': history,
-            'has_history': len(history) > 0
+            'has_history': bool(history)
         }
     
     def is_experiment_complete(self):
         """Check if this player has completed all rounds"""
-        return (self.round_number == C.NUM_ROUNDS and 
-                hasattr(self, 'choice') and 
-                self.choice is not None)
+        return self.round_number == C.NUM_ROUNDS and self.choice is not None
 
 
 class WaitForPartner(WaitPage):
@@ -247,16 +262,8 @@ class Results(Page):
             'total_payoff': player.get_total_payoff(),
             'is_final_round': is_final,
             'is_not_final_round': not is_final,
-            'result_text': {
-                'win': 'You Win!',
-                'lose': 'You Lose!',
-                'tie': "It's a Tie!"
-            }[player.result],
-            'result_class': {
-                'win': 'success',
-                'lose': 'danger', 
-                'tie': 'warning'
-            }[player.result],
+            'result_text': RESULT_TEXT[player.result],
+            'result_class': RESULT_CLASS[player.result],
             'status_message': "Game Complete! See final results." if is_final else f"Next: Round {player.round_number + 1}"
         }
 
@@ -278,10 +285,12 @@ class FinalResults(Page):
     def vars_for_template(player):
         opponent = player.get_opponent()
         
-        # Get complete history
+        # Get complete history (same opponent in every round, see get_round_history)
+        # and total both scores from the same rows rather than querying them again
         my_history = []
-        for round_player in player.in_all_rounds():
-            round_opponent = round_player.get_opponent()
+        my_total = 0
+        opponent_total = 0
+        for round_player, round_opponent in zip(player.in_all_rounds(), opponent.in_all_rounds()):
             my_history.append({
                 'round': round_player.round_number,
                 'my_choice': round_player.get_choice_display(),
@@ -289,10 +298,8 @@ class FinalResults(Page):
                 'result': round_player.result,
                 'payoff': round_player.round_payoff
             })
-        
-        # Calculate final scores
-        my_total = player.get_total_payoff()
-        opponent_total = opponent.get_total_payoff()
+            my_total += round_player.round_payoff
+            opponent_total += round_opponent.round_payoff
         
         if my_total > opponent_total:
             overall_result = 'win'
@@ -306,16 +313,8 @@ class FinalResults(Page):
             'opponent_total_payoff': opponent_total,
             'overall_result': overall_result,
             'history': my_history,
-            'overall_result_text': {
-                'win': 'You Won Overall!',
-                'lose': 'You Lost Overall!',
-                'tie': 'Overall Tie!'
-            }[overall_result],
-            'overall_result_class': {
-                'win': 'success',
-                'lose': 'danger',
-                'tie': 'warning'
-            }[overall_result]
+            'overall_result_text': OVERALL_RESULT_TEXT[overall_result],
+            'overall_result_class': RESULT_CLASS[overall_result]
         }
 
 
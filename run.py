@@ -9,7 +9,7 @@ import botex
 import sys
 import os
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import experiment and CLI functions
 from experiment import *
@@ -35,12 +35,17 @@ def validate_environment():
         return False
 
 
-def display_configuration_summary(args, player_models, player_roles, human_participants, bot_participants):
+def display_configuration_summary(args, player_models, player_roles, human_participants, bot_participants, unique_models):
     """Display a comprehensive configuration summary"""
-    unique_models = set(model for model in player_models.values() if model.lower() != 'human')
-    unique_roles = set(player_roles.values()) if player_roles else set()
     
-    print(f"""
+    # Group players by role in one pass instead of rescanning player_roles per role
+    players_by_role = {}
+    if player_roles:
+        for pid, role in player_roles.items():
+            players_by_role.setdefault(role, []).append(str(pid))
+    
+    # Collect the whole summary and print it in one call
+    lines = [f"""
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║                           EXPERIMENT CONFIGURATION                          ║
 ╠══════════════════════════════════════════════════════════════════════════════╣
@@ -53,43 +58,44 @@ def display_configuration_summary(args, player_models, player_roles, human_parti
 ║ Temperature:        {args.temperature:<56} ║
 ║ Output directory:   {args.output_dir:<56} ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
-""")
+"""]
     
     if unique_models:
-        print("Models in use:")
-        for model in sorted(unique_models):
-            print(f"  • {model}")
+        lines.append("Models in use:")
+        lines.extend(f"  • {model}" for model in sorted(unique_models))
     else:
-        print("Models in use: None (humans only)")
+        lines.append("Models in use: None (humans only)")
     
-    if unique_roles:
-        print(f"\nRoles assigned:")
-        for role in sorted(unique_roles):
-            players_with_role = [str(pid) for pid, prole in player_roles.items() if prole == role]
-            print(f"  • {role}: players {', '.join(players_with_role)}")
+    if players_by_role:
+        lines.append("\nRoles assigned:")
+        lines.extend(f"  • {role}: players {', '.join(players_by_role[role])}" for role in sorted(players_by_role))
     else:
-        print("\nRoles assigned: None (default prompts only)")
+        lines.append("\nRoles assigned: None (default prompts only)")
     
-    print()
+    lines.append("")
+    print("\n".join(lines))
 
 
 def display_participant_assignments(player_models, player_roles, available_models):
     """Display detailed participant assignments"""
-    print("Participant Assignments:")
-    print("-" * 60)
+    lines = ["Participant Assignments:", "-" * 60]
     
-    for player_id in sorted(player_models.keys()):
-        model_name = player_models[player_id]
-        role = player_roles.get(player_id, 'default') if player_roles else 'default'
+    if not player_roles:
+        player_roles = {}
+    
+    for player_id, model_name in sorted(player_models.items()):
+        role = player_roles.get(player_id, 'default')
         
-        if model_name.lower() == "human":
-            print(f"  Player {player_id}: HUMAN (role: {role})")
+        if model_name == HUMAN_MODEL:
+            lines.append(f"  Player {player_id}: HUMAN (role: {role})")
         else:
             if model_name in available_models:
                 provider = available_models[model_name]['provider']
-                print(f"  Player {player_id}: {model_name} ({provider}, role: {role})")
+                lines.append(f"  Player {player_id}: {model_name} ({provider}, role: {role})")
             else:
-                print(f"  Player {player_id}: {model_name} (UNKNOWN PROVIDER, role: {role})")
+                lines.append(f"  Player {player_id}: {model_name} (UNKNOWN PROVIDER, role: {role})")
+    
+    print("\n".join(lines))
 
 
 def handle_dry_run(args, player_models, player_roles, available_models):
@@ -115,7 +121,7 @@ def handle_dry_run(args, player_models, player_roles, available_models):
     return True
 
 
-def handle_validation_only(args, player_models, player_roles, available_models):
+def handle_validation_only(args, player_models, player_roles, available_models, unique_models):
     """Handle validation-only mode"""
     print("\n" + "="*60)
     print("                 VALIDATION MODE")
@@ -126,9 +132,14 @@ def handle_validation_only(args, player_models, player_roles, available_models):
     
     # Check 1: App configuration
     print("1. App configuration validation...")
-    app_dir = os.path.join(args.app)
     required_files = ['__init__.py', 'player_models.csv', 'prompts.py']
-    missing_files = [f for f in required_files if not os.path.exists(os.path.join(app_dir, f))]
+    # One directory listing instead of an existence probe per file
+    try:
+        with os.scandir(args.app) as entries:
+            present_files = {entry.name for entry in entries}
+    except OSError:
+        present_files = set()
+    missing_files = [f for f in required_files if f not in present_files]
     
     if not missing_files:
         print("   ✓ App configuration is complete")
@@ -136,6 +147,9 @@ def handle_validation_only(args, player_models, player_roles, available_models):
     else:
         print(f"   ✗ Missing files in app '{args.app}': {', '.join(missing_files)}")
     
+    if args.fail_fast and checks_passed < 1:
+        return report_validation_summary(checks_passed, total_checks, stopped_after=1)
+    
     # Check 2: Model mapping validation
     print("2. Model mapping validation...")
     if player_models:
@@ -144,6 +158,9 @@ def handle_validation_only(args, player_models, player_roles, available_models):
     else:
         print("   ✗ Model mapping validation failed")
     
+    if args.fail_fast and checks_passed < 2:
+        return report_validation_summary(checks_passed, total_checks, stopped_after=2)
+    
     # Check 3: Role validation
     print("3. Role assignment validation...")
     if player_roles:
@@ -151,7 +168,8 @@ def handle_validation_only(args, player_models, player_roles, available_models):
         available_roles = get_available_app_roles(args.app)
         
         if available_roles:
-            invalid_roles = [role for role in player_roles.values() if role not in available_roles]
+            valid_roles = frozenset(available_roles)
+            invalid_roles = [role for role in player_roles.values() if role not in valid_roles]
             if not invalid_roles:
                 print(f"   ✓ All assigned roles are valid for app '{args.app}'")
                 checks_passed += 1
@@ -165,6 +183,9 @@ def handle_validation_only(args, player_models, player_roles, available_models):
         print("   ✓ No specific roles assigned - will use default prompts")
         checks_passed += 1
     
+    if args.fail_fast and checks_passed < 3:
+        return report_validation_summary(checks_passed, total_checks, stopped_after=3)
+    
     # Check 4: All models are available
     print("4. Model availability check...")
     is_valid, error_msg = validate_player_models(player_models, available_models)
@@ -174,17 +195,20 @@ def handle_validation_only(args, player_models, player_roles, available_models):
     else:
         print(f"   ✗ Model validation failed: {error_msg}")
     
+    if args.fail_fast and checks_passed < 4:
+        return report_validation_summary(checks_passed, total_checks, stopped_after=4)
+    
     # Check 5: Environment configuration
     print("5. Environment configuration check...")
     config_issues = []
     
     # Check for required API keys based on models used
-    unique_models = set(model for model in player_models.values() if model.lower() != 'human')
+    env = os.environ
     for model_name in unique_models:
         if model_name in available_models:
             model_info = available_models[model_name]
             if model_info['api_key_env']:
-                api_key = os.environ.get(model_info['api_key_env'])
+                api_key = env.get(model_info['api_key_env'])
                 if not api_key:
                     config_issues.append(f"Missing API key: {model_info['api_key_env']}")
     
@@ -196,19 +220,44 @@ def handle_validation_only(args, player_models, player_roles, available_models):
         for issue in config_issues:
             print(f"     - {issue}")
     
+    if args.fail_fast and checks_passed < 5:
+        return report_validation_summary(checks_passed, total_checks, stopped_after=5)
+    
     # Check 6: Output directory permissions
     print("6. Output directory check...")
     try:
         os.makedirs(args.output_dir, exist_ok=True)
-        test_file = os.path.join(args.output_dir, ".test_write")
-        with open(test_file, 'w') as f:
-            f.write("test")
-        os.remove(test_file)
-        print("   ✓ Output directory is writable")
-        checks_passed += 1
+        if not os.access(args.output_dir, os.W_OK):
+            print(f"   ✗ Output directory issue: {args.output_dir} is not writable")
+        else:
+            # os.access checks the real uid and ignores ACLs, so confirm with a real write
+            test_file = os.path.join(args.output_dir, ".test_write")
+            with open(test_file, 'w') as f:
+                f.write("test")
+            os.remove(test_file)
+            print("   ✓ Output directory is writable")
+            checks_passed += 1
     except Exception as e:
         print(f"   ✗ Output directory issue: {str(e)}")
     
+    return report_validation_summary(checks_passed, total_checks)
+
+
+def report_validation_summary(checks_passed, total_checks, stopped_after=None):
+    """
+    Print the validation summary.
+    
+    Args:
+        checks_passed (int): Number of checks that passed
+        total_checks (int): Number of checks in the full validation run
+        stopped_after (int): Check number validation stopped at under --fail-fast, if any
+        
+    Returns:
+        bool: True if every check passed
+    """
+    if stopped_after is not None:
+        print(f"\nStopped after check {stopped_after} (--fail-fast)")
+    
     print(f"\nValidation Summary: {checks_passed}/{total_checks} checks passed")
     
     if checks_passed == total_checks:
@@ -220,28 +269,32 @@ def handle_validation_only(args, player_models, player_roles, available_models):
 
 
 def run_multiple_sessions(args, player_models, player_roles, is_human_list, available_models):
-    """Run multiple sessions concurrently"""
-    print(f"\nStarting {args.sessions} concurrent sessions...")
-    
-    with ThreadPoolExecutor(max_workers=args.sessions) as executor:
-        futures = [
-            executor.submit(run_session, args, i+1, player_models, player_roles, is_human_list, available_models) 
-            for i in range(args.sessions)
-        ]
+    """Run multiple sessions concurrently, at most args.max_concurrent at a time"""
+    max_workers = min(args.max_concurrent or args.sessions, args.sessions)
+    print(f"\nStarting {args.sessions} sessions ({max_workers} at a time)...")
+    
+    # Sessions spend their time blocked on oTree and LLM API calls inside botex,
+    # which is synchronous, so a thread per running session is the right fit
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_session, args, i, player_models, player_roles, is_human_list, available_models): i
+            for i in range(1, args.sessions + 1)
+        }
         
-        # Wait for all sessions to complete
-        results = []
-        for i, future in enumerate(futures, 1):
+        # Report sessions as they finish; results stay in session order for the summary
+        results = [None] * args.sessions
+        for future in as_completed(futures):
+            i = futures[future]
             try:
                 result = future.result()
-                results.append(result)
                 if result["success"]:
                     print(f"✓ Session {i} completed successfully: {result['session_id']}")
                 else:
                     print(f"✗ Session {i} failed: {result.get('error', 'Unknown error')}")
             except Exception as e:
                 print(f"✗ Session {i} failed with exception: {str(e)}")
-                results.append({"success": False, "error": str(e)})
+                result = {"success": False, "error": str(e)}
+            results[i - 1] = result
         
         # Print final summary
         successes = sum(1 for r in results if r.get("success", False))
@@ -282,9 +335,8 @@ def main():
         # Handle help or argument errors gracefully
         sys.exit(e.code)
     
-    # Set up logging level
+    # Logging level is configured by parse_arguments()
     if args.verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
         logger.info("Verbose logging enabled")
     
     # Validate environment and dependencies
@@ -293,11 +345,11 @@ def main():
         sys.exit(1)
     
     # Load app-specific participant assignments from CSV (now with roles)
-    logger.info(f"Loading participant assignments for app '{args.app}'")
+    logger.info("Loading participant assignments for app '%s'", args.app)
     player_models, player_roles, is_human_list, total_participants = get_app_specific_model_mapping(args.app)
     
     if player_models is None:
-        logger.error(f"Failed to load participant assignments for app '{args.app}'")
+        logger.error("Failed to load participant assignments for app '%s'", args.app)
         print(f"""
 ERROR: Could not load participant assignments for app '{args.app}'.
 
@@ -314,12 +366,14 @@ Use --list-apps to see available apps.
         sys.exit(1)
     
     # Calculate derived values
-    human_participants = sum(1 for is_human in is_human_list if is_human)
+    human_participants = sum(is_human_list)
     bot_participants = total_participants - human_participants
+    unique_models = frozenset(model for model in player_models.values() if model != HUMAN_MODEL)
     
     # Load available models from environment
     available_models = get_available_models()
-    logger.info(f"Available models: {list(available_models.keys())}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Available models: %s", list(available_models))
     
     # Validate the player model assignments
     is_valid, error_msg = validate_player_models(player_models, available_models)
@@ -331,7 +385,7 @@ Use --list-apps to see available apps.
         sys.exit(1)
     
     # Display configuration summary
-    display_configuration_summary(args, player_models, player_roles, human_participants, bot_participants)
+    display_configuration_summary(args, player_models, player_roles, human_participants, bot_participants, unique_models)
     
     # Handle special modes
     if hasattr(args, 'dry_run') and args.dry_run:
@@ -339,15 +393,15 @@ Use --list-apps to see available apps.
         return
     
     if hasattr(args, 'validate_only') and args.validate_only:
-        success = handle_validation_only(args, player_models, player_roles, available_models)
+        success = handle_validation_only(args, player_models, player_roles, available_models, unique_models)
         sys.exit(0 if success else 1)
     
     # Create output directory
     try:
         os.makedirs(args.output_dir, exist_ok=True)
-        logger.info(f"Output directory created/verified: {args.output_dir}")
+        logger.info("Output directory created/verified: %s", args.output_dir)
     except Exception as e:
-        logger.error(f"Failed to create output directory: {str(e)}")
+        logger.error("Failed to create output directory: %s", e)
         sys.exit(1)
     
     # Display participant assignments for verification
@@ -361,7 +415,7 @@ Use --list-apps to see available apps.
         
         # Start oTree server
         otree_process = botex.start_otree_server(project_path=".", timeout=15)
-        logger.info(f"✓ oTree server started at {args.otree_url}")
+        logger.info("✓ oTree server started at %s", args.otree_url)
         
         try:
             # Run sessions
@@ -394,7 +448,7 @@ Use --list-apps to see available apps.
         logger.info("Experiment interrupted by user")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Unexpected error during experiment: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during experiment: %s", e, exc_info=True)
         print(f"\nUnexpected error: {str(e)}")
         sys.exit(1)
     
@@ -0,0 +1,132 @@
+"""Tests for exporting botex responses to a SQLite database"""
+
+import csv
+import json
+import sqlite3
+
+import pytest
+
+import experiment
+from experiment import RESPONSE_FIELDNAMES, export_response_data, write_responses_to_sqlite
+
+
+def make_botex_db(path, session_id='sess1'):
+    """Create a minimal botex database holding one bot conversation"""
+    conversation = [
+        {'role': 'user', 'content': 'Round 1: choose Rock, Paper or Scissors'},
+        {'role': 'assistant', 'content': json.dumps({
+            'summary': 'Picked rock',
+            'answers': {'choice': {'answer': 'R', 'reason': 'Rock is solid'}}
+        })},
+    ]
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE conversations (id text, bot_parms text, conversation text)")
+    conn.execute(
+        "INSERT INTO conversations VALUES (?, ?, ?)",
+        ('p1', json.dumps({'session_id': session_id}), json.dumps(conversation))
+    )
+    conn.commit()
+    conn.close()
+
+
+def read_responses(db_file):
+    conn = sqlite3.connect(db_file)
+    try:
+        return conn.execute("SELECT * FROM responses").fetchall()
+    finally:
+        conn.close()
+
+
+def test_sqlite_export_writes_responses_table(tmp_path):
+    botex_db = tmp_path / 'botex.sqlite3'
+    make_botex_db(botex_db)
+    out = tmp_path / 'out.sqlite'
+    
+    export_response_data(str(out), str(botex_db), 'sess1')
+    
+    assert read_responses(out) == [
+        ('sess1', 'p1', 1, 'choice', 'R', 'Rock is solid', 'Picked rock',
+         'Round 1: choose Rock, Paper or Scissors')
+    ]
+
+
+def test_sqlite_export_failure_writes_error_row_to_database(tmp_path):
+    out = tmp_path / 'out.sqlite'
+    
+    export_response_data(str(out), str(tmp_path / 'missing.sqlite3'), 'sess1')
+    
+    assert out.read_bytes().startswith(b'SQLite format 3\x00')
+    rows = read_responses(out)
+    assert len(rows) == 1
+    row = dict(zip(RESPONSE_FIELDNAMES, rows[0]))
+    assert row['session_id'] == 'sess1'
+    assert row['question_id'] == 'export_error'
+    assert not (tmp_path / 'out.csv').exists()
+
+
+def test_sqlite_export_botex_fallback_writes_sibling_csv(tmp_path, monkeypatch):
+    written = []
+    
+    def fake_export(csv_file, botex_db=None, session_id=None):
+        written.append(csv_file)
+        with open(csv_file, 'w') as f:
+            f.write('session_id\n')
+    
+    monkeypatch.setattr(experiment.botex, 'export_response_data', fake_export)
+    out = tmp_path / 'out.db'
+    
+    export_response_data(str(out), str(tmp_path / 'missing.sqlite3'), 'sess1')
+    
+    assert written == [str(tmp_path / 'out.csv')]
+    assert not out.exists()
+
+
+def test_interrupted_sqlite_write_keeps_previous_database(tmp_path):
+    out = tmp_path / 'out.sqlite'
+    row = ('sess1', 'p1', 1, 'choice', 'R', '', '', '')
+    write_responses_to_sqlite([[row]], str(out))
+    
+    def interrupted_batches():
+        yield [row]
+        raise KeyboardInterrupt
+    
+    with pytest.raises(KeyboardInterrupt):
+        write_responses_to_sqlite(interrupted_batches(), str(out))
+    
+    assert read_responses(out) == [row]
+    assert list(tmp_path.iterdir()) == [out]
+
+
+def make_conversation(rounds):
+    """One prompt/answer pair per (round, answer) entry"""
+    messages = []
+    for round_number, answer in rounds:
+        messages.append({'role': 'user', 'content': f'Round {round_number}'})
+        messages.append({'role': 'assistant', 'content': json.dumps(
+            {'answers': {'move': {'answer': answer, 'reason': ''}}}
+        )})
+    return json.dumps(messages)
+
+
+def test_repeated_conversation_ids_are_exported_in_baseline_order(tmp_path):
+    # p1 has two conversation rows (e.g. a restarted bot) separated by p0's row
+    botex_db = tmp_path / 'botex.sqlite3'
+    conn = sqlite3.connect(botex_db)
+    conn.execute("CREATE TABLE conversations (id text, bot_parms text, conversation text)")
+    bot_parms = json.dumps({'session_id': 'sess1'})
+    conn.executemany("INSERT INTO conversations VALUES (?, ?, ?)", [
+        ('p1', bot_parms, make_conversation([(1, 'R'), (2, 'S')])),
+        ('p0', bot_parms, make_conversation([(1, 'P')])),
+        ('p1', bot_parms, make_conversation([(1, 'P')])),
+    ])
+    conn.commit()
+    conn.close()
+    out = tmp_path / 'out.csv'
+    
+    export_response_data(str(out), str(botex_db), 'sess1')
+    
+    with open(out, newline='') as f:
+        rows = [(r['participant_id'], r['round'], r['answer']) for r in csv.DictReader(f)]
+    # Sorted by participant and round across all of a participant's conversations,
+    # with ties kept in conversation row order
+    assert rows == [('p0', '1', 'P'), ('p1', '1', 'R'), ('p1', '1', 'P'), ('p1', '2', 'S')]
@@ -0,0 +1,29 @@
+"""Tests for the noisy request log filter"""
+
+import logging
+
+import pytest
+
+from cli import LogFilter
+
+
+def make_record(msg, *args):
+    return logging.LogRecord('botex', logging.INFO, __file__, 1, msg, args, None)
+
+
+@pytest.mark.parametrize('msg, args', [
+    ('HTTP Request: POST https://api.example.com "HTTP/1.1 200 OK"', ()),
+    ('%s', ('HTTP Request: POST https://api.example.com "HTTP/1.1 200 OK"',)),
+    ('Throttling: Request error: %s', ('rate limited',)),
+    ('%s: %s', ('Throttling', 'Request error: rate limited')),
+])
+def test_noisy_records_are_dropped(msg, args):
+    assert not LogFilter().filter(make_record(msg, *args))
+
+
+@pytest.mark.parametrize('msg, args', [
+    ('Bot started for participant %s', ('abc123',)),
+    ('Session completed', ()),
+])
+def test_other_records_pass(msg, args):
+    assert LogFilter().filter(make_record(msg, *args))
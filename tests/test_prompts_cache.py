@@ -0,0 +1,36 @@
+"""Tests for the per-app prompts module cache"""
+
+import os
+
+import experiment
+
+
+def write_prompts(app_dir, version):
+    prompts_file = app_dir / 'prompts.py'
+    prompts_file.write_text(
+        f"def get_prompts(role=None):\n    return {{'system': 'v{version}'}}\n\n"
+        f"def get_available_roles():\n    return ['R{version}']\n"
+    )
+    # Distinct mtimes even on filesystems with coarse timestamps
+    os.utime(prompts_file, ns=(version * 10**9, version * 10**9))
+
+
+def test_prompts_edit_replaces_cached_module_and_results(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app_dir = tmp_path / 'app'
+    app_dir.mkdir()
+    
+    write_prompts(app_dir, 1)
+    assert experiment.load_app_prompts('app', 'x') == {'system': 'v1'}
+    assert experiment.get_available_app_roles('app') == ['R1']
+    old_module = experiment.load_prompts_module('app')
+    assert experiment.load_prompts_module('app') is old_module
+    
+    write_prompts(app_dir, 2)
+    assert experiment.load_app_prompts('app', 'x') == {'system': 'v2'}
+    assert experiment.get_available_app_roles('app') == ['R2']
+    
+    # Only the current version is kept
+    assert old_module not in experiment.APP_PROMPTS_CACHE
+    assert old_module not in experiment.APP_ROLES_CACHE
+    assert experiment.PROMPTS_MODULE_CACHE['app'][1] is experiment.load_prompts_module('app')